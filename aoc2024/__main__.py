@@ -0,0 +1,4 @@
+import sys
+from aoc2024.runner import main
+
+sys.exit(main())
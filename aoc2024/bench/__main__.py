@@ -0,0 +1,4 @@
+import sys
+from aoc2024.bench.suite import main
+
+sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Day 24 devices: a ripple-carry adder of any width, with pairs of gate outputs
+swapped to break it.
+"""
+
+import random
+import string
+
+# Each full adder bit has these gates:
+#   partial_sum = x XOR y       partial_carry = x AND y
+#   z = partial_sum XOR carry_in
+#   overflow = partial_sum AND carry_in
+#   carry_out = overflow OR partial_carry
+# Swapping any of these pairs breaks the adder without creating a cycle.
+SWAPPABLE_PAIRS = [
+    ("partial_sum", "partial_carry"),
+    ("z", "overflow"),
+    ("z", "carry_out"),
+    ("z", "partial_carry"),
+]
+MAX_BITS = 99
+"Wire names are always three characters, so bits only go up to z99"
+
+
+def ripple_carry_adder(bits: int, swaps: int = 4, seed: int = 0) -> list[str]:
+    """
+    Initial x and y values, a blank line, then one gate per line. Every swap
+    is in a different bit, never the first or last.
+    """
+    assert 2 <= bits <= MAX_BITS
+    assert swaps <= bits - 2, "not enough bits to swap in"
+    rng = random.Random(seed)
+    used_names = set[str]()
+
+    def new_name() -> str:
+        while True:
+            # leave out x, y and z, which are reserved for inputs and outputs
+            name = "".join(rng.choices(string.ascii_lowercase[:23], k=3))
+            if name not in used_names:
+                used_names.add(name)
+                return name
+
+    # (inputs, operator, output)
+    gates = list[tuple[list[str], str, str]]()
+
+    def add_gate(a: str, operator: str, b: str, output: str):
+        inputs = [a, b]
+        rng.shuffle(inputs)
+        gates.append((inputs, operator, output))
+
+    add_gate("x00", "XOR", "y00", "z00")
+    carry = new_name()
+    add_gate("x00", "AND", "y00", carry)
+
+    swapped_bits = set(rng.sample(range(1, bits - 1), swaps))
+    for bit in range(1, bits):
+        x, y = f"x{bit:02}", f"y{bit:02}"
+        outputs = {
+            "partial_sum": new_name(),
+            "partial_carry": new_name(),
+            "z": f"z{bit:02}",
+            "overflow": new_name(),
+            "carry_out": new_name() if bit < bits - 1 else f"z{bits:02}",
+        }
+        wires = outputs.copy()
+        if bit in swapped_bits:
+            first, second = rng.choice(SWAPPABLE_PAIRS)
+            outputs[first], outputs[second] = outputs[second], outputs[first]
+        add_gate(x, "XOR", y, outputs["partial_sum"])
+        add_gate(x, "AND", y, outputs["partial_carry"])
+        add_gate(wires["partial_sum"], "XOR", carry, outputs["z"])
+        add_gate(wires["partial_sum"], "AND", carry, outputs["overflow"])
+        add_gate(wires["overflow"], "OR", wires["partial_carry"], outputs["carry_out"])
+        carry = wires["carry_out"]
+
+    rng.shuffle(gates)
+    lines = [f"x{bit:02}: {rng.randint(0, 1)}" for bit in range(bits)]
+    lines += [f"y{bit:02}: {rng.randint(0, 1)}" for bit in range(bits)]
+    lines.append("")
+    lines += [f"{a} {operator} {b} -> {output}" for [a, b], operator, output in gates]
+    return lines
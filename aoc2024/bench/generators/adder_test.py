@@ -0,0 +1,32 @@
+from aoc2024.bench.generators.adder import ripple_carry_adder
+from aoc2024.puzzles.day24 import Device
+from aoc2024.puzzles.day24_part2 import validate_adder_bit
+
+
+def read_input(device: Device, prefix: str) -> int:
+    bits = sorted((k for k in device.wires if k.startswith(prefix)), reverse=True)
+    return int("".join("1" if device.wires[k] else "0" for k in bits), 2)
+
+
+def test_working_adder():
+    lines = ripple_carry_adder(20, swaps=0, seed=12)
+    device = Device.parse(lines)
+    x, y = read_input(device, "x"), read_input(device, "y")
+    assert all(validate_adder_bit(device, bit) == [] for bit in range(2, 20))
+    device.simulate()
+    assert device.extract_output() == x + y
+
+
+def test_swaps():
+    lines = ripple_carry_adder(20, swaps=4, seed=12)
+    assert lines == ripple_carry_adder(20, swaps=4, seed=12)
+    device = Device.parse(lines)
+    broken_bits = {
+        anomaly.output_bit
+        for bit in range(2, 20)
+        for anomaly in validate_adder_bit(device, bit)
+    }
+    assert len(broken_bits) > 0
+    # swaps never create a cycle, so every output still gets a value
+    device.simulate()
+    assert all(f"z{bit:02}" in device.wires for bit in range(21))
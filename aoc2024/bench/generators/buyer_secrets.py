@@ -0,0 +1,10 @@
+"Day 22 lists of initial secret numbers, one per buyer"
+
+import random
+
+SECRET_LIMIT = 16777216
+
+
+def buyer_secrets(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [str(rng.randrange(1, SECRET_LIMIT)) for _ in range(count)]
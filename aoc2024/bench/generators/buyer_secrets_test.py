@@ -0,0 +1,9 @@
+from aoc2024.bench.generators.buyer_secrets import SECRET_LIMIT, buyer_secrets
+
+
+def test_buyer_secrets():
+    lines = buyer_secrets(100, seed=9)
+    assert len(lines) == 100
+    assert all(0 < int(line) < SECRET_LIMIT for line in lines)
+    assert buyer_secrets(100, seed=9) == lines
+    assert buyer_secrets(100, seed=10) != lines
@@ -0,0 +1,13 @@
+"Day 09 disk maps: alternating file and free-space lengths as a single line of digits"
+
+import random
+
+
+def disk_map(files: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    digits = list[str]()
+    for i in range(files):
+        if i > 0:
+            digits.append(str(rng.randint(0, 9)))
+        digits.append(str(rng.randint(1, 9)))
+    return "".join(digits)
@@ -0,0 +1,11 @@
+from aoc2024.bench.generators.disk_map import disk_map
+from aoc2024.puzzles import day09
+
+
+def test_disk_map():
+    line = disk_map(50, seed=3)
+    assert len(line) == 99
+    assert all(line[i] != "0" for i in range(0, len(line), 2))
+    assert disk_map(50, seed=3) == line
+    assert day09.part_one_answer(line) > 0
+    assert day09.part_two_answer(line) > 0
@@ -0,0 +1,32 @@
+"Day 18 lists of falling bytes, as `x,y` coordinates on a memory space of any size"
+
+import random
+from aoc2024.common.grid import GridShape, IntVector2
+
+
+def falling_bytes(shape: GridShape, safe_count: int, seed: int = 0) -> list[str]:
+    """
+    Every coordinate except the start and the exit, in a random order. The
+    first `safe_count` bytes all stay off one randomly chosen route, so the
+    exit is reachable for at least that long; after that, the route is
+    eventually cut off.
+    """
+    rng = random.Random(seed)
+    start = IntVector2(0, 0)
+
+    # a staircase of random right and down steps
+    steps = [IntVector2(1, 0)] * (shape.width - 1) + [IntVector2(0, 1)] * (
+        shape.height - 1
+    )
+    rng.shuffle(steps)
+    route = [start]
+    for step in steps:
+        route.append(route[-1] + step)
+    on_route = set(route)
+
+    off_route = [coord for coord in shape.all_coords() if coord not in on_route]
+    assert safe_count <= len(off_route), "not enough room to keep a route open"
+    rng.shuffle(off_route)
+    rest = off_route[safe_count:] + route[1:-1]
+    rng.shuffle(rest)
+    return [f"{c.x},{c.y}" for c in off_route[:safe_count] + rest]
@@ -0,0 +1,15 @@
+from aoc2024.bench.generators.falling_bytes import falling_bytes
+from aoc2024.common.grid import GridShape
+from aoc2024.puzzles import day18
+
+
+def test_falling_bytes():
+    shape = GridShape(15, 15)
+    lines = falling_bytes(shape, safe_count=100, seed=7)
+    assert len(lines) == 15 * 15 - 2
+    assert len(set(lines)) == len(lines)
+    assert "0,0" not in lines and "14,14" not in lines
+    assert day18.part_one_answer(lines, shape=shape, falling_ticks=100) >= 28
+    blocker = day18.part_two_answer(lines, shape=shape)
+    assert lines.index(blocker) >= 100
+    assert falling_bytes(shape, safe_count=100, seed=7) == lines
@@ -0,0 +1,64 @@
+"Day 06 lab maps: `.` floor, `#` obstructions and the guard `^`, who always walks off the map"
+
+import random
+from aoc2024.common.grid import Direction, GridShape, IntVector2
+
+MAX_ATTEMPTS = 100
+"How many random maps to try before giving up on finding a guard who leaves"
+
+
+def guard_map(
+    width: int, height: int, obstacle_density: float = 0.05, seed: int = 0
+) -> list[str]:
+    shape = GridShape(width, height)
+    rng = random.Random(seed)
+    for _ in range(MAX_ATTEMPTS):
+        obstacles = {
+            coord for coord in shape.all_coords() if rng.random() < obstacle_density
+        }
+        free = [coord for coord in shape.all_coords() if coord not in obstacles]
+        # some guards get stuck in a loop, and most wander off the map quickly,
+        # so try a few starting points and keep the longest patrol
+        patrols = list[tuple[int, IntVector2]]()
+        for start in rng.sample(free, min(len(free), 20)):
+            steps = patrol_length(shape, obstacles, start)
+            if steps is not None:
+                patrols.append((steps, start))
+        if len(patrols) > 0:
+            # by length alone, since IntVector2 can't be compared
+            _, start = max(patrols, key=lambda patrol: patrol[0])
+            return format_guard_map(shape, obstacles, start)
+    raise ValueError(
+        f"no guard left a {width}x{height} map with obstacle density"
+        f" {obstacle_density} (seed {seed}) in {MAX_ATTEMPTS} attempts"
+    )
+
+
+def patrol_length(
+    shape: GridShape, obstacles: set[IntVector2], start: IntVector2
+) -> int | None:
+    "How many steps the guard takes before leaving, or None if they never do"
+    position = start
+    direction = Direction.UP
+    seen = set[tuple[IntVector2, Direction]]()
+    while shape.is_in_bounds(position):
+        if (position, direction) in seen:
+            return None
+        seen.add((position, direction))
+        next_position = position + direction.to_vector()
+        if next_position in obstacles:
+            direction = direction.clockwise()
+        else:
+            position = next_position
+    return len(seen)
+
+
+def format_guard_map(
+    shape: GridShape, obstacles: set[IntVector2], start: IntVector2
+) -> list[str]:
+    rows = [
+        ["#" if IntVector2(x, y) in obstacles else "." for x in range(shape.width)]
+        for y in range(shape.height)
+    ]
+    rows[start.y][start.x] = "^"
+    return ["".join(row) for row in rows]
@@ -0,0 +1,28 @@
+import pytest
+from aoc2024.bench.generators.guard_map import guard_map
+from aoc2024.puzzles.day06 import GuardMap, PathResultType
+
+
+def test_guard_map():
+    lines = guard_map(30, 20, seed=1)
+    assert len(lines) == 20
+    assert all(len(line) == 30 for line in lines)
+    assert sum(line.count("^") for line in lines) == 1
+    assert GuardMap.parse(lines).get_path().type == PathResultType.EXITED
+
+
+def test_deterministic():
+    assert guard_map(30, 30, seed=5) == guard_map(30, 30, seed=5)
+    assert guard_map(30, 30, seed=5) != guard_map(30, 30, seed=6)
+
+
+def test_many_seeds():
+    # ties between the longest patrols used to fall back on comparing starts
+    for seed in range(30):
+        lines = guard_map(10, 10, seed=seed)
+        assert GuardMap.parse(lines).get_path().type == PathResultType.EXITED
+
+
+def test_impossible():
+    with pytest.raises(ValueError, match="obstacle density 1.0"):
+        guard_map(5, 5, obstacle_density=1.0)
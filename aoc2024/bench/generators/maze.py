@@ -0,0 +1,112 @@
+"""
+Day 16 mazes and day 20 racetracks, carved out of a solid grid so that there's
+always a path from `S` (bottom left) to `E` (top right).
+"""
+
+import random
+from aoc2024.common.grid import GridShape, IntVector2
+
+
+def maze(
+    width: int, height: int, loop_chance: float = 0.05, seed: int = 0
+) -> list[str]:
+    """
+    A maze with one route between any two points, plus extra gaps knocked
+    into `loop_chance` of the remaining inner walls so that some places can
+    be reached more than one way.
+    """
+    rng = random.Random(seed)
+    shape, open_cells = carve(width, height, rng)
+    for coord in shape.all_coords():
+        if coord in open_cells or not is_inner_wall(shape, coord):
+            continue
+        if rng.random() < loop_chance:
+            open_cells.add(coord)
+    return format_maze(shape, open_cells)
+
+
+def racetrack(width: int, height: int, seed: int = 0) -> list[str]:
+    "A single track with no branches, winding from start to end"
+    rng = random.Random(seed)
+    shape, open_cells = carve(width, height, rng)
+    start, end = endpoints(shape)
+
+    came_from = {start: start}
+    stack = [start]
+    while len(stack) > 0:
+        current = stack.pop()
+        for n in current.cardinal_neighbors():
+            if n in open_cells and n not in came_from:
+                came_from[n] = current
+                stack.append(n)
+
+    track = {end}
+    current = end
+    while current != start:
+        current = came_from[current]
+        track.add(current)
+    return format_maze(shape, track)
+
+
+def endpoints(shape: GridShape) -> tuple[IntVector2, IntVector2]:
+    return IntVector2(1, shape.height - 2), IntVector2(shape.width - 2, 1)
+
+
+def carve(width: int, height: int, rng: random.Random):
+    """
+    Depth-first "recursive backtracker": rooms sit on odd coordinates, and
+    the walls between them get knocked down as each room is first visited.
+    Even sizes are rounded up, so the outer wall is always solid.
+    """
+    assert width >= 3 and height >= 3, "too small to fit a maze"
+    shape = GridShape(width | 1, height | 1)
+    start, _ = endpoints(shape)
+    open_cells = {start}
+    stack = [start]
+    while len(stack) > 0:
+        current = stack[-1]
+        unvisited = [
+            room
+            for step in (
+                IntVector2(0, -2),
+                IntVector2(2, 0),
+                IntVector2(0, 2),
+                IntVector2(-2, 0),
+            )
+            if is_room(shape, room := current + step) and room not in open_cells
+        ]
+        if len(unvisited) == 0:
+            stack.pop()
+            continue
+        room = rng.choice(unvisited)
+        open_cells.add(IntVector2((current.x + room.x) // 2, (current.y + room.y) // 2))
+        open_cells.add(room)
+        stack.append(room)
+    return shape, open_cells
+
+
+def is_room(shape: GridShape, coord: IntVector2):
+    return (
+        0 < coord.x < shape.width - 1
+        and 0 < coord.y < shape.height - 1
+        and coord.x % 2 == 1
+        and coord.y % 2 == 1
+    )
+
+
+def is_inner_wall(shape: GridShape, coord: IntVector2):
+    "Walls that sit directly between two rooms"
+    if not (0 < coord.x < shape.width - 1 and 0 < coord.y < shape.height - 1):
+        return False
+    return (coord.x % 2) != (coord.y % 2)
+
+
+def format_maze(shape: GridShape, open_cells: set[IntVector2]) -> list[str]:
+    start, end = endpoints(shape)
+    rows = [
+        ["." if IntVector2(x, y) in open_cells else "#" for x in range(shape.width)]
+        for y in range(shape.height)
+    ]
+    rows[start.y][start.x] = "S"
+    rows[end.y][end.x] = "E"
+    return ["".join(row) for row in rows]
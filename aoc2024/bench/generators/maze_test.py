@@ -0,0 +1,34 @@
+from aoc2024.bench.generators.maze import maze, racetrack
+from aoc2024.common.grid import BasicGrid
+from aoc2024.puzzles import day16, day20
+
+
+def test_maze():
+    lines = maze(21, 15, seed=2)
+    assert len(lines) == 15
+    assert all(len(line) == 21 for line in lines)
+    assert day16.part_one_answer(lines) > 0
+    assert maze(21, 15, seed=2) == lines
+
+
+def test_even_sizes_are_rounded_up():
+    lines = maze(20, 14)
+    assert len(lines) == 15
+    assert len(lines[0]) == 21
+
+
+def test_racetrack_has_no_branches():
+    lines = racetrack(31, 31, seed=4)
+    grid = BasicGrid.parse_char_grid(lines)
+    for coord, char in grid.all_items():
+        if char == "#":
+            continue
+        open_neighbors = [
+            n
+            for n in coord.cardinal_neighbors()
+            if grid.get_if_in_bounds(n) not in (None, "#")
+        ]
+        expected = 1 if char in "SE" else 2
+        assert len(open_neighbors) == expected
+    maze_ = day20.Maze.parse(lines)
+    assert len(maze_.get_legit_path()) == sum(line.count(".") for line in lines) + 1
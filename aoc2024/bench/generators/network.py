@@ -0,0 +1,38 @@
+"Day 23 network maps: a sparse random graph of two-letter computers, with one big LAN party planted in it"
+
+import itertools
+import random
+import string
+
+ALL_NAMES = [
+    "".join(pair) for pair in itertools.product(string.ascii_lowercase, repeat=2)
+]
+
+
+def network(
+    computers: int, degree: int = 13, party_size: int = 13, seed: int = 0
+) -> list[str]:
+    """
+    `degree` is the average number of connections per computer. The random
+    connections are sparse enough that the planted party is (all but
+    certainly) the largest set of computers that are all connected.
+    """
+    assert computers <= len(ALL_NAMES), "only so many two-letter names to go around"
+    assert party_size <= computers
+    rng = random.Random(seed)
+    names = rng.sample(ALL_NAMES, computers)
+
+    connections = set[frozenset[str]]()
+    for a, b in itertools.combinations(names[:party_size], 2):
+        connections.add(frozenset((a, b)))
+    all_pairs = computers * (computers - 1) // 2
+    target = min(all_pairs, max(len(connections), computers * degree // 2))
+    while len(connections) < target:
+        connections.add(frozenset(rng.sample(names, 2)))
+
+    # string hashes (and so set order) change between runs, so sort first
+    pairs = sorted(sorted(connection) for connection in connections)
+    for pair in pairs:
+        rng.shuffle(pair)
+    rng.shuffle(pairs)
+    return ["-".join(pair) for pair in pairs]
@@ -0,0 +1,17 @@
+from aoc2024.bench.generators.network import network
+from aoc2024.puzzles.day23 import NetworkConnections
+
+
+def test_network():
+    lines = network(200, degree=6, party_size=8, seed=11)
+    assert len(lines) == 200 * 6 // 2
+    assert all(len(line) == 5 and line[2] == "-" for line in lines)
+    assert network(200, degree=6, party_size=8, seed=11) == lines
+    largest = NetworkConnections.parse(lines).find_largest_cluster()
+    assert len(largest) == 8
+
+
+def test_fully_connected():
+    # more connections than there are pairs of computers
+    lines = network(13, seed=3)
+    assert len(lines) == 13 * 12 // 2
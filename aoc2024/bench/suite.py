@@ -0,0 +1,542 @@
+"""Benchmarks every solution against the sample inputs from the *_test.py files,
+plus scaled-up versions of them (or, for some days, bigger generated inputs),
+and checks for regressions against a stored baseline.
+
+Usage:
+
+    python -m aoc2024.bench --save-baseline
+    # ...make changes...
+    python -m aoc2024.bench --threshold 0.1
+"""
+
+import argparse
+from dataclasses import asdict, dataclass, field
+import functools
+import importlib
+import inspect
+import json
+import math
+from pathlib import Path
+import string
+import sys
+from typing import Any, Callable, Collection, Iterator, Mapping, Sequence, cast
+from aoc2024.bench.generators.adder import MAX_BITS, ripple_carry_adder
+from aoc2024.bench.generators.buyer_secrets import buyer_secrets
+from aoc2024.bench.generators.disk_map import disk_map
+from aoc2024.bench.generators.falling_bytes import falling_bytes
+from aoc2024.bench.generators.guard_map import guard_map
+from aoc2024.bench.generators.maze import maze, racetrack
+from aoc2024.bench.generators.network import ALL_NAMES, network
+from aoc2024.common.grid import GridShape
+import aoc2024.common.input as aoc_input
+from aoc2024.puzzles import day14, day18
+from aoc2024.runner import Skipped, Solver, discover_solvers, format_ns, time_solver
+
+DEFAULT_BASELINE_PATH = Path("bench_baseline.json")
+GENERATOR_SEED = 2024
+
+# Days whose test files don't have a module-level sample input
+EXTRA_SAMPLES: dict[int, str | list[str]] = {
+    9: "2333133121414131402",
+    11: "125 17",
+    16: aoc_input.lines(
+        """
+###############
+#.......#....E#
+#.#.###.#.###.#
+#.....#.#...#.#
+#.###.#####.#.#
+#.#.#.......#.#
+#.#.#####.###.#
+#...........#.#
+###.#.#####.#.#
+#...#.....#.#.#
+#.#.#.###.#.#.#
+#.....#...#.#.#
+#.###.#.#.#.#.#
+#S..#.....#...#
+###############
+"""
+    ),
+    21: ["029A", "980A", "179A", "456A", "379A"],
+    22: ["1", "10", "100", "2024"],
+}
+
+# Extra arguments some solutions need to make sense of a sample input
+SAMPLE_KWARGS: dict[tuple[int, int], dict[str, object]] = {
+    (14, 1): {"shape": day14.sample_shape()},
+    (18, 1): {"shape": day18.sample_shape(), "falling_ticks": 12},
+    (18, 2): {"shape": day18.sample_shape()},
+}
+
+
+def repeat_lines(lines: list[str], factor: int) -> list[str]:
+    return lines * factor
+
+
+def repeat_words(lines: list[str], factor: int) -> list[str]:
+    return [" ".join([line] * factor) for line in lines]
+
+
+def repeat_sections(lines: list[str], factor: int) -> list[str]:
+    result = list[str]()
+    for _ in range(factor):
+        if len(result) > 0:
+            result.append("")
+        result.extend(lines)
+    return result
+
+
+def repeat_after_header(lines: list[str], factor: int) -> list[str]:
+    "For inputs where everything after the first section is a list of records"
+    separator = lines.index("")
+    return lines[: separator + 1] + lines[separator + 1 :] * factor
+
+
+def tile_grid(lines: list[str], factor: int) -> list[str]:
+    "Tiles a grid across and down, for about `factor` times the area"
+    side = max(1, round(math.sqrt(factor)))
+    return [line * side for line in lines] * side
+
+
+ANTENNA_FREQUENCIES = string.digits + string.ascii_letters
+
+
+def tile_antennas(lines: list[str], factor: int) -> list[str]:
+    """
+    Tiles day 08's map, but gives the tiles along each row and column of
+    tiles different frequencies, so that no two antennas of one frequency end
+    up in the same row (part two can't handle that, and real inputs don't have it)
+    """
+    side = max(1, round(math.sqrt(factor)))
+    frequencies = sorted({char for line in lines for char in line if char.isalnum()})
+    spare = [char for char in ANTENNA_FREQUENCIES if char not in frequencies]
+    assert (side - 1) * len(frequencies) <= len(spare), "too many tiles"
+    # one translation per diagonal of tiles; the main diagonal keeps the sample's
+    count = len(frequencies)
+    translations: list[dict[int, str]] = [{}]
+    for diagonal in range(side - 1):
+        replacements = spare[diagonal * count : (diagonal + 1) * count]
+        translations.append(dict(zip(map(ord, frequencies), replacements)))
+    return [
+        "".join(
+            line.translate(translations[(tile_y - tile_x) % side])
+            for tile_x in range(side)
+        )
+        for tile_y in range(side)
+        for line in lines
+    ]
+
+
+def tile_warehouse(lines: list[str], factor: int) -> list[str]:
+    "Tiles day 15's map, keeping only the first robot, and repeats the moves"
+    separator = lines.index("")
+    robot_found = False
+    warehouse = list[str]()
+    for line in tile_grid(lines[:separator], factor):
+        if robot_found:
+            line = line.replace("@", ".")
+        elif "@" in line:
+            robot_found = True
+            robot = line.index("@")
+            line = line[: robot + 1] + line[robot + 1 :].replace("@", ".")
+        warehouse.append(line)
+    return warehouse + [""] + lines[separator + 1 :] * factor
+
+
+type Scaler = Callable[[list[str], int], list[str]]
+
+# How to build a bigger input out of each day's sample
+SCALERS: dict[int, Scaler] = {
+    1: repeat_lines,
+    2: repeat_lines,
+    3: repeat_lines,
+    4: tile_grid,
+    5: repeat_after_header,
+    7: repeat_lines,
+    8: tile_antennas,
+    10: tile_grid,
+    11: repeat_words,
+    12: tile_grid,
+    13: repeat_sections,
+    14: repeat_lines,
+    15: tile_warehouse,
+    19: repeat_after_header,
+}
+
+
+@dataclass(frozen=True)
+class Generated:
+    puzzle_input: str | list[str]
+    "Passed to each part's solution, if it takes them"
+    kwargs: Mapping[str, object] = field(default_factory=dict[str, object])
+
+
+def scaled_side(sample_side: int, factor: int) -> int:
+    "The side of a square grid with about `factor` times the area of the sample's"
+    return round(sample_side * math.sqrt(factor))
+
+
+def generate_guard_map(factor: int) -> Generated:
+    side = scaled_side(10, factor)
+    return Generated(guard_map(side, side, seed=GENERATOR_SEED))
+
+
+def generate_disk_map(factor: int) -> Generated:
+    return Generated(disk_map(10 * factor, seed=GENERATOR_SEED))
+
+
+def generate_maze(factor: int) -> Generated:
+    side = scaled_side(15, factor)
+    return Generated(maze(side, side, seed=GENERATOR_SEED))
+
+
+def generate_falling_bytes(factor: int) -> Generated:
+    side = scaled_side(7, factor)
+    shape = GridShape(side, side)
+    # about the same proportion as the real input
+    falling_ticks = side * side // 5
+    lines = falling_bytes(shape, safe_count=falling_ticks, seed=GENERATOR_SEED)
+    return Generated(lines, {"shape": shape, "falling_ticks": falling_ticks})
+
+
+def generate_racetrack(factor: int) -> Generated:
+    side = scaled_side(15, factor)
+    return Generated(racetrack(side, side, seed=GENERATOR_SEED))
+
+
+def generate_buyer_secrets(factor: int) -> Generated:
+    return Generated(buyer_secrets(4 * factor, seed=GENERATOR_SEED))
+
+
+def generate_network(factor: int) -> Generated:
+    computers = min(len(ALL_NAMES), 16 * factor)
+    return Generated(network(computers, seed=GENERATOR_SEED))
+
+
+def generate_adder(factor: int) -> Generated:
+    bits = min(MAX_BITS, 5 * factor)
+    return Generated(ripple_carry_adder(bits, seed=GENERATOR_SEED))
+
+
+# Days where repeating the sample wouldn't make a valid (or interesting) input,
+# so bigger inputs are generated from scratch instead.
+# Some formats can't grow forever, so their sizes are capped.
+GENERATORS: dict[int, Callable[[int], Generated]] = {
+    6: generate_guard_map,
+    9: generate_disk_map,
+    16: generate_maze,
+    18: generate_falling_bytes,
+    20: generate_racetrack,
+    22: generate_buyer_secrets,
+    23: generate_network,
+    24: generate_adder,
+}
+
+
+@functools.cache
+def generate(day: int, factor: int) -> Generated:
+    "Cached, so that both parts of a day share an input"
+    return GENERATORS[day](factor)
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    solver: Solver
+    puzzle_input: str | list[str]
+    kwargs: Mapping[str, object] = field(default_factory=dict[str, object])
+
+    @property
+    def input_bytes(self) -> int:
+        if isinstance(self.puzzle_input, str):
+            return len(self.puzzle_input.encode())
+        return sum(len(line.encode()) + 1 for line in self.puzzle_input)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    day: int
+    part: int
+    input_bytes: int
+    median_ns: float
+    answer: str
+
+    @property
+    def throughput(self) -> float:
+        "Input bytes processed per second"
+        return self.input_bytes / (self.median_ns / 1e9)
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "throughput": self.throughput}
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline_throughput: float
+    throughput: float
+
+    @property
+    def slowdown(self) -> float:
+        "How much throughput was lost, from 0 (none) to 1 (all of it)"
+        return 1 - self.throughput / self.baseline_throughput
+
+    @property
+    def missing(self) -> bool:
+        "The case is in the baseline, but failed or doesn't exist anymore"
+        return self.throughput == 0
+
+
+def as_puzzle_input(value: object) -> str | list[str] | None:
+    "Some test files have already parsed their sample input; those can't be used"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        items = cast(list[object], value)
+        if all(isinstance(item, str) for item in items):
+            return [str(item) for item in items]
+    return None
+
+
+def find_sample(day: int) -> str | list[str] | None:
+    if day in EXTRA_SAMPLES:
+        return EXTRA_SAMPLES[day]
+    try:
+        test_module = importlib.import_module(f"aoc2024.puzzles.day{day:02}_test")
+    except ImportError:
+        test_module = None
+    for name in ("SAMPLE_INPUT_LINES", "SAMPLE_INPUT", "LARGE_INPUT"):
+        sample = as_puzzle_input(getattr(test_module, name, None))
+        if sample is not None:
+            return sample
+    try:
+        return aoc_input.load_lines(f"day{day:02}sample")
+    except FileNotFoundError:
+        return None
+
+
+def accepted_kwargs(solver: Solver, kwargs: Mapping[str, object]) -> dict[str, object]:
+    parameters = inspect.signature(solver.func).parameters
+    return {k: v for k, v in kwargs.items() if k in parameters}
+
+
+def scale_input(
+    puzzle_input: str | list[str], scaler: Scaler, factor: int
+) -> str | list[str]:
+    if isinstance(puzzle_input, str):
+        return "\n".join(scaler(puzzle_input.splitlines(), factor))
+    return scaler(puzzle_input, factor)
+
+
+def build_cases(
+    days: Sequence[int] | None = None, scales: Sequence[int] = (10, 100)
+) -> Iterator[BenchCase | Skipped]:
+    for solver in discover_solvers(days):
+        if isinstance(solver, Skipped):
+            yield solver
+            continue
+        sample = find_sample(solver.day)
+        if sample is None:
+            yield Skipped(solver.day, solver.part, "no sample input")
+            continue
+        kwargs = SAMPLE_KWARGS.get((solver.day, solver.part), {})
+        prefix = f"day{solver.day:02}.part{solver.part}"
+        yield BenchCase(f"{prefix}.sample", solver, sample, kwargs)
+
+        if solver.day in GENERATORS:
+            for factor in scales:
+                generated = generate(solver.day, factor)
+                yield BenchCase(
+                    f"{prefix}.x{factor}",
+                    solver,
+                    generated.puzzle_input,
+                    accepted_kwargs(solver, generated.kwargs),
+                )
+            continue
+
+        scaler = SCALERS.get(solver.day)
+        if scaler is None:
+            continue
+        for factor in scales:
+            yield BenchCase(
+                f"{prefix}.x{factor}",
+                solver,
+                scale_input(sample, scaler, factor),
+                kwargs,
+            )
+
+
+def run_case(case: BenchCase, repeat: int, warmup: int) -> BenchResult:
+    timing = time_solver(
+        case.solver, case.puzzle_input, repeat=repeat, warmup=warmup, kwargs=case.kwargs
+    )
+    return BenchResult(
+        case.name,
+        case.solver.day,
+        case.solver.part,
+        case.input_bytes,
+        timing.median_ns,
+        timing.answer,
+    )
+
+
+def compare(
+    results: Sequence[BenchResult],
+    baseline: Mapping[str, Mapping[str, Any]],
+    threshold: float,
+    days: Collection[int] | None = None,
+    scales: Collection[int] | None = None,
+) -> list[Regression]:
+    """
+    Returns every result whose throughput dropped by more than `threshold`
+    (e.g. 0.1 for 10%) compared to the baseline. Cases missing from the
+    baseline are ignored, but baseline cases with no result (because they
+    failed or were removed) count as regressions with a throughput of 0.
+    Only baseline cases for the `days` and `scales` that were run are
+    expected to have a result; None means all of them.
+    """
+    by_name = {result.name: result for result in results}
+    regressions = list[Regression]()
+    for name, previous in baseline.items():
+        baseline_throughput = float(previous["throughput"])
+        result = by_name.get(name)
+        if result is None:
+            if was_run(name, int(previous["day"]), days, scales):
+                regressions.append(Regression(name, baseline_throughput, 0))
+            continue
+        if result.throughput < baseline_throughput * (1 - threshold):
+            regressions.append(
+                Regression(result.name, baseline_throughput, result.throughput)
+            )
+    return regressions
+
+
+def was_run(
+    name: str,
+    day: int,
+    days: Collection[int] | None,
+    scales: Collection[int] | None,
+) -> bool:
+    "Whether a case with this name would have been run for these days and scales"
+    if days is not None and day not in days:
+        return False
+    label = name.rsplit(".", 1)[-1]
+    if scales is None or label == "sample":
+        return True
+    return label in (f"x{factor}" for factor in scales)
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def save_baseline(path: Path, results: Sequence[BenchResult]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"cases": {r.name: r.to_json() for r in results}}, f, indent=2)
+
+
+def format_throughput(bytes_per_second: float) -> str:
+    if bytes_per_second >= 1e6:
+        return f"{bytes_per_second / 1e6:.2f} MB/s"
+    return f"{bytes_per_second / 1e3:.2f} kB/s"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2024.bench",
+        description="Benchmark solutions on sample and scaled-up inputs",
+    )
+    parser.add_argument(
+        "days", nargs="*", type=int, help="Days to run; defaults to every day"
+    )
+    parser.add_argument(
+        "--scale",
+        dest="scales",
+        action="append",
+        type=int,
+        help="Scale factor for generated inputs; can be repeated. Defaults to 10 and 100",
+    )
+    parser.add_argument(
+        "-r", "--repeat", default=5, type=int, help="Timed runs per case"
+    )
+    parser.add_argument(
+        "-w", "--warmup", default=1, type=int, help="Untimed runs before timing"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE_PATH,
+        help=f"Baseline file to compare against or save to. Defaults to {DEFAULT_BASELINE_PATH}",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save these results as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        default=0.1,
+        type=float,
+        help="Fail if throughput drops by more than this fraction. Defaults to 0.1",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH", help="Also write the results to PATH as JSON"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    days: list[int] | None = args.days or None
+    scales: list[int] = args.scales or [10, 100]
+    baseline_path: Path = args.baseline
+    threshold: float = args.threshold
+
+    results = list[BenchResult]()
+    failures = list[str]()
+    for case in build_cases(days, scales):
+        if isinstance(case, Skipped):
+            continue
+        try:
+            result = run_case(case, repeat=args.repeat, warmup=args.warmup)
+        except Exception as e:
+            print(f"{case.name}: failed ({type(e).__name__}: {e})", file=sys.stderr)
+            failures.append(case.name)
+            continue
+        results.append(result)
+        print(
+            f"{result.name}: {format_ns(result.median_ns)}"
+            f"  ({format_throughput(result.throughput)})"
+        )
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.to_json() for r in results], f, indent=2)
+
+    failed = 1 if len(failures) > 0 else 0
+    if args.save_baseline:
+        save_baseline(baseline_path, results)
+        print(f"Saved baseline to {baseline_path}")
+        return failed
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline first")
+        return failed
+
+    regressions = compare(
+        results, load_baseline(baseline_path), threshold, days=days, scales=scales
+    )
+    for r in regressions:
+        if r.missing:
+            print(f"REGRESSION {r.name}: failed or missing", file=sys.stderr)
+            continue
+        print(
+            f"REGRESSION {r.name}: {format_throughput(r.baseline_throughput)}"
+            f" -> {format_throughput(r.throughput)} ({r.slowdown:.0%} slower)",
+            file=sys.stderr,
+        )
+    return 1 if len(regressions) > 0 else failed
@@ -0,0 +1,122 @@
+from pathlib import Path
+from aoc2024.bench.suite import (
+    BenchCase,
+    BenchResult,
+    build_cases,
+    compare,
+    load_baseline,
+    repeat_after_header,
+    repeat_sections,
+    repeat_words,
+    save_baseline,
+    tile_antennas,
+    tile_grid,
+    tile_warehouse,
+)
+
+
+def result(name: str, median_ns: float, day: int = 1) -> BenchResult:
+    return BenchResult(name, day, 1, input_bytes=1000, median_ns=median_ns, answer="0")
+
+
+def test_compare():
+    baseline = {
+        "steady": result("steady", 1000).to_json(),
+        "slower": result("slower", 1000).to_json(),
+        "within_threshold": result("within_threshold", 1000).to_json(),
+    }
+    results = [
+        result("steady", 900),
+        result("slower", 2000),
+        result("within_threshold", 1050),
+        result("new", 5000),
+    ]
+    regressions = compare(results, baseline, threshold=0.1)
+    assert [r.name for r in regressions] == ["slower"]
+    assert regressions[0].slowdown == 0.5
+
+
+def test_compare_missing_cases():
+    baseline = {
+        "day01.part1.sample": result("day01.part1.sample", 1000).to_json(),
+        "day01.part1.x10": result("day01.part1.x10", 1000).to_json(),
+        "day01.part1.x100": result("day01.part1.x100", 1000).to_json(),
+        "day02.part1.sample": result("day02.part1.sample", 1000, day=2).to_json(),
+    }
+    results = [result("day01.part1.sample", 1000)]
+    # crashed, removed or not run
+    regressions = compare(results, baseline, threshold=0.1)
+    assert [r.name for r in regressions] == [
+        "day01.part1.x10",
+        "day01.part1.x100",
+        "day02.part1.sample",
+    ]
+    assert all(r.missing and r.slowdown == 1 for r in regressions)
+    # only the days and scales that were run are expected
+    regressions = compare(results, baseline, threshold=0.1, days=[1], scales=[10])
+    assert [r.name for r in regressions] == ["day01.part1.x10"]
+
+
+def test_baseline_round_trip(tmp_path: Path):
+    path = tmp_path / "baseline.json"
+    save_baseline(path, [result("a", 1000)])
+    baseline = load_baseline(path)
+    assert baseline["a"]["throughput"] == result("a", 1000).throughput
+    assert compare([result("a", 1000)], baseline, threshold=0.1) == []
+
+
+def test_scalers():
+    assert repeat_words(["1 2"], 2) == ["1 2 1 2"]
+    assert repeat_sections(["a", "b"], 2) == ["a", "b", "", "a", "b"]
+    assert repeat_after_header(["h", "", "a", "b"], 2) == [
+        "h",
+        "",
+        "a",
+        "b",
+        "a",
+        "b",
+    ]
+
+
+def test_grid_scalers():
+    assert tile_grid(["ab", "cd"], 4) == ["abab", "cdcd", "abab", "cdcd"]
+    assert tile_warehouse(["#@.#", "", "<>"], 4) == [
+        "#@.##..#",
+        "#@.##..#".replace("@", "."),
+        "",
+        "<>",
+        "<>",
+        "<>",
+        "<>",
+    ]
+    # no frequency shows up twice in a row of tiles, or in a column
+    assert tile_antennas(["a.", ".b"], 4) == ["a.0.", ".b.1", "0.a.", ".1.b"]
+
+
+def test_build_cases():
+    cases = list(build_cases([2], scales=[10]))
+    assert all(isinstance(case, BenchCase) for case in cases)
+    assert [case.name for case in cases if isinstance(case, BenchCase)] == [
+        "day02.part1.sample",
+        "day02.part1.x10",
+        "day02.part2.sample",
+        "day02.part2.x10",
+    ]
+    sample, scaled = cases[0], cases[1]
+    assert isinstance(sample, BenchCase) and isinstance(scaled, BenchCase)
+    assert scaled.input_bytes == sample.input_bytes * 10
+
+
+def test_generated_cases():
+    cases = [c for c in build_cases([18], scales=[10]) if isinstance(c, BenchCase)]
+    assert [case.name for case in cases] == [
+        "day18.part1.sample",
+        "day18.part1.x10",
+        "day18.part2.sample",
+        "day18.part2.x10",
+    ]
+    part_one, part_two = cases[1], cases[3]
+    assert part_one.puzzle_input == part_two.puzzle_input
+    assert set(part_one.kwargs) == {"shape", "falling_ticks"}
+    # part two doesn't take falling_ticks
+    assert set(part_two.kwargs) == {"shape"}
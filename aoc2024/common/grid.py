@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum, auto
 from functools import cached_property
 from typing import Callable, Iterator, Optional, Self
+import numpy as np
+import numpy.typing as npt
 
 
 class Direction(Enum):
@@ -95,6 +97,12 @@ class IntVector2:
 
 @dataclass
 class GridShape:
+    """
+    Besides IntVector2 coordinates, a shape also supports "packed" coordinates:
+    a single int `y * width + x`, the same as its array index. Packed coordinates
+    are cheaper to step, hash and compare, which matters in hot loops.
+    """
+
     width: int
     height: int
 
@@ -108,6 +116,54 @@ class GridShape:
     def coordinate_for_index(self, index: int) -> IntVector2:
         return IntVector2((index % self.width), index // self.width)
 
+    def pack(self, coord: IntVector2) -> int:
+        "Alias for array_index(); does not support a negative coord"
+        return coord.y * self.width + coord.x
+
+    def unpack(self, packed: int) -> IntVector2:
+        "Alias for coordinate_for_index()"
+        return IntVector2((packed % self.width), packed // self.width)
+
+    @cached_property
+    def cardinal_offsets(self) -> tuple[int, int, int, int]:
+        "Packed offsets in the same order as IntVector2.cardinal_directions()"
+        return (-self.width, 1, self.width, -1)
+
+    def direction_offset(self, direction: Direction) -> int:
+        match direction:
+            case Direction.UP:
+                return -self.width
+            case Direction.DOWN:
+                return self.width
+            case Direction.LEFT:
+                return -1
+            case Direction.RIGHT:
+                return 1
+
+    @cached_property
+    def cardinal_bounds_masks(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """
+        One mask per entry in cardinal_offsets. mask[packed] is 1 if stepping
+        in that direction from `packed` stays in bounds, 0 otherwise.
+        """
+        width, height = self.width, self.height
+        inner_row = b"\x01" * width
+        up = b"\x00" * width + inner_row * (height - 1)
+        down = inner_row * (height - 1) + b"\x00" * width
+        right = (b"\x01" * (width - 1) + b"\x00") * height
+        left = (b"\x00" + b"\x01" * (width - 1)) * height
+        return (up, right, down, left)
+
+    @cached_property
+    def _packed_offsets_and_masks(self) -> tuple[tuple[int, bytes], ...]:
+        return tuple(zip(self.cardinal_offsets, self.cardinal_bounds_masks))
+
+    def packed_cardinal_neighbors(self, packed: int) -> Iterator[int]:
+        "Yields only neighbors that are in bounds"
+        for offset, mask in self._packed_offsets_and_masks:
+            if mask[packed]:
+                yield packed + offset
+
     def all_coords(self) -> Iterator[IntVector2]:
         for y in range(self.height):
             for x in range(self.width):
@@ -155,6 +211,13 @@ class BasicGrid[T]:
     def shape(self) -> GridShape:
         return GridShape(self.width, len(self.items) // self.width)
 
+    def get_packed(self, packed: int) -> T:
+        "See GridShape for an explanation of packed coordinates"
+        return self.items[packed]
+
+    def set_packed(self, packed: int, value: T):
+        self.items[packed] = value
+
     def __getitem__(self, key: IntVector2.IntoIntVector) -> T:
         return self.items[self.shape.array_index(IntVector2.normalize_input(key))]
 
@@ -207,3 +270,146 @@ class BasicGrid[T]:
     def all_items(self) -> Iterator[tuple[IntVector2, T]]:
         for coord in self.shape.all_coords():
             yield (coord, self[coord])
+
+
+class ArrayGrid[DType: np.generic]:
+    """
+    Like BasicGrid, but backed by a 2D NumPy array indexed [y, x], so that
+    whole-grid operations (masks, comparisons with shifted neighbors, lookups)
+    run as vectorized array operations instead of once per cell.
+    """
+
+    array: npt.NDArray[DType]
+
+    def __init__(self, array: npt.NDArray[DType]):
+        assert array.ndim == 2, "ArrayGrid must be backed by a 2D array"
+        self.array = array
+
+    @property
+    def width(self) -> int:
+        return self.array.shape[1]
+
+    @cached_property
+    def shape(self) -> GridShape:
+        height, width = self.array.shape
+        return GridShape(width, height)
+
+    @property
+    def items(self) -> npt.NDArray[DType]:
+        """
+        The grid flattened, indexed by packed coordinates. Only a view if the
+        array is contiguous (a strided one, like from CharGridView, gets copied),
+        so write through set_packed() instead.
+        """
+        return self.array.reshape(-1)
+
+    def get_packed(self, packed: int) -> DType:
+        return self.array.flat[packed]
+
+    def set_packed(self, packed: int, value: DType | int | bool):
+        # unlike reshape(), .flat writes through even if the array is strided
+        self.array.flat[packed] = value
+
+    def __getitem__(self, key: IntVector2.IntoIntVector) -> DType:
+        key = IntVector2.normalize_input(key)
+        return self.array[key.y, key.x]
+
+    def __setitem__(self, key: IntVector2.IntoIntVector, value: DType | int | bool):
+        key = IntVector2.normalize_input(key)
+        self.array[key.y, key.x] = value
+
+    def get_if_in_bounds(self, key: IntVector2.IntoIntVector) -> Optional[DType]:
+        key = IntVector2.normalize_input(key)
+        if self.shape.is_in_bounds(key):
+            return self[key]
+        else:
+            return None
+
+    @staticmethod
+    def parse_char_grid(lines: list[str] | bytes) -> "ArrayGrid[np.uint8]":
+        """
+        Each cell is the byte value of its character, e.g. `grid.array == ord("#")`.
+        Accepts either a list of lines or the raw bytes of a file.
+        """
+        if isinstance(lines, bytes):
+            data = lines.strip(b"\n")
+            width = data.find(b"\n")
+            if width == -1:
+                width = len(data)
+            assert (len(data) + 1) % (width + 1) == 0, "mismatched line widths"
+            rows = np.frombuffer(data + b"\n", dtype=np.uint8).reshape(-1, width + 1)
+            assert np.all(rows[:, -1] == ord("\n")), "mismatched line widths"
+            # drop the newline column
+            return ArrayGrid(rows[:, :-1].copy())
+
+        expected_width = len(lines[0])
+        for i, line in enumerate(lines):
+            assert len(line) == expected_width, f"mismatched width for line {i}"
+        data = "".join(lines).encode("ascii")
+        return ArrayGrid(
+            np.frombuffer(data, dtype=np.uint8)
+            .reshape(len(lines), expected_width)
+            .copy()
+        )
+
+    @staticmethod
+    def filled(
+        shape: GridShape, value: int | bool, dtype: type[DType]
+    ) -> "ArrayGrid[DType]":
+        return ArrayGrid(np.full((shape.height, shape.width), value, dtype=dtype))
+
+    @staticmethod
+    def from_basic_grid(
+        grid: "BasicGrid[int] | BasicGrid[bool]", dtype: type[DType]
+    ) -> "ArrayGrid[DType]":
+        array = np.array(grid.items, dtype=dtype).reshape(-1, grid.width)
+        return ArrayGrid(array)
+
+    def to_basic_grid(self) -> "BasicGrid[DType]":
+        return BasicGrid(list(self.items), self.width)
+
+    def map[
+        Output
+    ](self, func: Callable[[IntVector2, DType], Output]) -> "BasicGrid[Output]":
+        "Calls `func` once per cell; prefer operating on `array` directly where possible"
+        return self.to_basic_grid().map(func)
+
+    def shifted(self, offset: IntVector2, fill: int | bool = 0) -> "ArrayGrid[DType]":
+        """
+        Returns a grid where each cell holds the value of the cell at `coord + offset`
+        in this grid, or `fill` where that would be out of bounds. For example,
+        `grid.array == grid.shifted(IntVector2(1, 0)).array` compares every cell to
+        its right-hand neighbor.
+        """
+        height, width = self.array.shape
+        result = np.full_like(self.array, fill)
+        dx, dy = offset.x, offset.y
+        if abs(dx) < width and abs(dy) < height:
+            result[
+                max(0, -dy) : height - max(0, dy), max(0, -dx) : width - max(0, dx)
+            ] = self.array[
+                max(0, dy) : height - max(0, -dy), max(0, dx) : width - max(0, -dx)
+            ]
+        return ArrayGrid(result)
+
+    def coords_where(
+        self, mask: "npt.NDArray[np.bool_] | ArrayGrid[np.bool_]"
+    ) -> list[IntVector2]:
+        "Returns the coordinates of every cell where `mask` is True, in row order"
+        if isinstance(mask, ArrayGrid):
+            mask = mask.array
+        ys, xs = np.nonzero(mask)
+        return [IntVector2(int(x), int(y)) for y, x in zip(ys, xs)]
+
+    def find(self, value: int | bool) -> list[IntVector2]:
+        return self.coords_where(self.array == value)
+
+    def format_char_grid(self: "ArrayGrid[np.uint8]") -> str:
+        return "\n".join(row.tobytes().decode("ascii") for row in self.array)
+
+    def copy(self) -> "ArrayGrid[DType]":
+        return ArrayGrid(self.array.copy())
+
+    def all_items(self) -> Iterator[tuple[IntVector2, DType]]:
+        for coord in self.shape.all_coords():
+            yield (coord, self[coord])
@@ -1,6 +1,13 @@
 from textwrap import dedent
+import numpy as np
 import aoc2024.common.input as aoc_input
-from aoc2024.common.grid import BasicGrid
+from aoc2024.common.grid import (
+    ArrayGrid,
+    BasicGrid,
+    Direction,
+    GridShape,
+    IntVector2,
+)
 
 
 class TestBasicGrid:
@@ -24,3 +31,72 @@ class TestBasicGrid:
         assert grid.shape.width == 10
         assert grid.shape.height == 10
         assert grid.format_char_grid().splitlines() == test_input
+
+
+class TestPackedCoordinates:
+    def test_pack_roundtrip(self):
+        shape = GridShape(4, 3)
+        for coord in shape.all_coords():
+            packed = shape.pack(coord)
+            assert packed == shape.array_index(coord)
+            assert shape.unpack(packed) == coord
+
+    def test_offsets_match_directions(self):
+        shape = GridShape(4, 3)
+        origin = IntVector2(1, 1)
+        for offset, direction in zip(
+            shape.cardinal_offsets, IntVector2.cardinal_directions()
+        ):
+            assert shape.pack(origin) + offset == shape.pack(origin + direction)
+        for direction in Direction:
+            assert shape.pack(origin) + shape.direction_offset(direction) == shape.pack(
+                origin + direction.to_vector()
+            )
+
+    def test_packed_neighbors_stay_in_bounds(self):
+        shape = GridShape(4, 3)
+        for coord in shape.all_coords():
+            expected = {
+                shape.pack(n)
+                for n in coord.cardinal_neighbors()
+                if shape.is_in_bounds(n)
+            }
+            assert set(shape.packed_cardinal_neighbors(shape.pack(coord))) == expected
+
+
+class TestArrayGrid:
+    def test_parse(self):
+        lines = ["#..", ".#.", "..#"]
+        from_lines = ArrayGrid.parse_char_grid(lines)
+        from_bytes = ArrayGrid.parse_char_grid(b"#..\n.#.\n..#\n")
+        assert from_lines.shape == GridShape(3, 3)
+        assert (from_lines.array == from_bytes.array).all()
+        assert from_lines.format_char_grid().splitlines() == lines
+        assert from_lines[1, 1] == ord("#")
+        assert from_lines.find(ord("#")) == [
+            IntVector2(0, 0),
+            IntVector2(1, 1),
+            IntVector2(2, 2),
+        ]
+
+    def test_shifted(self):
+        grid = ArrayGrid.parse_char_grid(["ab", "cd"])
+        right = grid.shifted(IntVector2(1, 0), fill=ord("."))
+        assert right.format_char_grid() == "b.\nd."
+        up = grid.shifted(IntVector2(0, -1), fill=ord("."))
+        assert up.format_char_grid() == "..\nab"
+
+    def test_matches_basic_grid(self):
+        basic = BasicGrid.parse_char_grid(["ab", "cd"])
+        grid = ArrayGrid.parse_char_grid(["ab", "cd"])
+        for coord, value in basic.all_items():
+            assert chr(grid[coord]) == value
+            assert grid.shape.pack(coord) == basic.shape.pack(coord)
+
+    def test_set_packed_strided(self):
+        backing = np.zeros((2, 3), dtype=np.uint8)
+        # skips the last column, like CharGridView skips newlines
+        grid = ArrayGrid(backing[:, :2])
+        grid.set_packed(3, 7)
+        assert grid.get_packed(3) == 7
+        assert backing[1, 1] == 7
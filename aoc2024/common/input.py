@@ -1,7 +1,20 @@
+from collections.abc import Buffer
+from dataclasses import dataclass
+from functools import cached_property
+import mmap
 from pathlib import Path
+import re
+from typing import Iterable, Iterator
+import numpy as np
+import numpy.typing as npt
+from aoc2024.common.grid import GridShape, IntVector2
 
 
 PUZZLES_DIR = (Path(__file__) / "../../puzzles").resolve()
+TRIM_EOF_LINE = True
+"Default for lines() and friends: remove a blank trailing line"
+TRIM_STARTING_BLANK_LINE = True
+"Default for lines() and friends: remove a blank line at the very beginning"
 
 
 def load(name: str, *_: None, parent_dir: Path = PUZZLES_DIR) -> str:
@@ -9,11 +22,130 @@ def load(name: str, *_: None, parent_dir: Path = PUZZLES_DIR) -> str:
         return f.read()
 
 
+def load_bytes(name: str, *_: None, parent_dir: Path = PUZZLES_DIR) -> bytes:
+    with open(parent_dir / f"{name}.txt", "rb") as f:
+        return f.read()
+
+
+def load_mmap(name: str, *_: None, parent_dir: Path = PUZZLES_DIR) -> mmap.mmap:
+    """Maps a file into memory read-only, without reading it all up front.
+
+    Use as a context manager to unmap it when done:
+
+        with aoc_input.load_mmap("day09input") as data:
+            ...
+
+    Any memoryviews taken from the map (e.g. from iter_buffer_lines() or
+    CharGridView) must be released before it's closed.
+    """
+    with open(parent_dir / f"{name}.txt", "rb") as f:
+        # the map stays valid after the file is closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+_NEWLINE = re.compile(b"\n")
+
+
+def _find_newline(view: memoryview, start: int = 0) -> int:
+    "Like bytes.find(), but memoryview can't search, and a regex searches it in place"
+    match = _NEWLINE.search(view, start)
+    return match.start() if match is not None else -1
+
+
+def iter_buffer_lines(buffer: Buffer) -> Iterator[memoryview]:
+    """Lazily splits a bytes-like buffer (such as from load_mmap()) on newlines.
+
+    Each line is a zero-copy memoryview into the buffer, not including the newline.
+    Like str.splitlines(), a trailing newline doesn't produce an extra blank line.
+    """
+    view = memoryview(buffer).cast("B")
+    start = 0
+    end = len(view)
+    while start < end:
+        newline = _find_newline(view, start)
+        if newline == -1:
+            newline = end
+        line_end = newline
+        if line_end > start and view[line_end - 1] == ord("\r"):
+            line_end -= 1
+        yield view[start:line_end]
+        start = newline + 1
+
+
+@dataclass(frozen=True)
+class CharGridView:
+    """A read-only character grid that indexes straight into a buffer of lines,
+    such as from load_mmap(), without copying it.
+
+    Cells are byte values, e.g. `view[coord] == ord("#")`.
+    """
+
+    buffer: Buffer
+
+    @cached_property
+    def _view(self) -> memoryview:
+        return memoryview(self.buffer).cast("B")
+
+    @cached_property
+    def _stride(self) -> int:
+        "Bytes per line, including the newline"
+        newline = _find_newline(self._view)
+        return newline + 1 if newline != -1 else len(self._view) + 1
+
+    @cached_property
+    def _line_ending(self) -> int:
+        "1 for \\n, or 2 for \\r\\n"
+        newline = self._stride - 1
+        return 2 if newline > 0 and self._view[newline - 1] == ord("\r") else 1
+
+    @cached_property
+    def shape(self) -> GridShape:
+        stride = self._stride
+        line_ending = self._line_ending
+        # the last line may or may not have a trailing line ending
+        height = (len(self._view) + line_ending) // stride
+        assert height * stride in (
+            len(self._view),
+            len(self._view) + line_ending,
+        ), "mismatched line widths"
+        return GridShape(stride - line_ending, height)
+
+    def __getitem__(self, key: IntVector2.IntoIntVector) -> int:
+        key = IntVector2.normalize_input(key)
+        return self._view[key.y * self._stride + key.x]
+
+    def get_packed(self, packed: int) -> int:
+        "See GridShape for an explanation of packed coordinates"
+        width = self.shape.width
+        return self._view[(packed // width) * self._stride + packed % width]
+
+    def get_if_in_bounds(self, key: IntVector2.IntoIntVector) -> int | None:
+        key = IntVector2.normalize_input(key)
+        if self.shape.is_in_bounds(key):
+            return self[key]
+        else:
+            return None
+
+    def row(self, y: int) -> memoryview:
+        start = y * self._stride
+        return self._view[start : start + self.shape.width]
+
+    def as_array(self) -> npt.NDArray[np.uint8]:
+        "A zero-copy [y, x] NumPy view of the grid, skipping over the line endings"
+        shape = self.shape
+        return np.ndarray(
+            (shape.height, shape.width),
+            dtype=np.uint8,
+            buffer=self._view,
+            strides=(self._stride, 1),
+        )
+
+
 def lines(
     file_contents: str,
     *_: None,
-    trim_eof_line: bool = True,
-    trim_starting_blank_line: bool = True,
+    trim_eof_line: bool = TRIM_EOF_LINE,
+    trim_starting_blank_line: bool = TRIM_STARTING_BLANK_LINE,
 ) -> list[str]:
     """Split file contents into a list of lines.
 
@@ -33,9 +165,9 @@ def lines(
 def load_lines(
     name: str,
     *_: None,
-    parent_dir: Path = load.__kwdefaults__["parent_dir"],
-    trim_eof_line: bool = lines.__kwdefaults__["trim_eof_line"],
-    trim_starting_blank_line: bool = lines.__kwdefaults__["trim_starting_blank_line"],
+    parent_dir: Path = PUZZLES_DIR,
+    trim_eof_line: bool = TRIM_EOF_LINE,
+    trim_starting_blank_line: bool = TRIM_STARTING_BLANK_LINE,
 ):
     """Loads a file and splits it into a list of lines. Equivalent to calling input.load() and then input.lines()
 
@@ -53,3 +185,53 @@ def load_lines(
         trim_starting_blank_line=trim_starting_blank_line,
     )
     return result
+
+
+def iter_lines(
+    name: str,
+    *_: None,
+    parent_dir: Path = PUZZLES_DIR,
+    trim_eof_line: bool = TRIM_EOF_LINE,
+    trim_starting_blank_line: bool = TRIM_STARTING_BLANK_LINE,
+) -> Iterator[str]:
+    """Streams a file line by line, with the same trimming as input.load_lines().
+    The file stays open until the iterator is exhausted or closed.
+
+    Args:
+        name (str)
+        parent_dir (Path, optional)
+        trim_eof_line (bool, optional): Removes a blank trailing newline. Defaults to True.
+        trim_starting_blank_line (bool, optional): Removes a blank line at the very beginning. Defaults to True.
+    """
+    with open(parent_dir / f"{name}.txt", encoding="utf-8") as f:
+        stripped = (line.rstrip("\r\n") for line in f)
+        first = next(stripped, None)
+        if first is None:
+            return
+        # hold each line back until we know whether it's the last one
+        pending = first
+        if trim_starting_blank_line and first == "":
+            pending = next(stripped, None)
+            if pending is None:
+                return
+        for line in stripped:
+            yield pending
+            pending = line
+        if not (trim_eof_line and pending == ""):
+            yield pending
+
+
+def iter_sections(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Groups lines into sections separated by blank lines, for multi-part inputs.
+    Works on a list of lines or lazily on a stream such as input.iter_lines().
+    """
+    section = list[str]()
+    for line in lines:
+        if line == "":
+            if len(section) > 0:
+                yield section
+                section = list[str]()
+        else:
+            section.append(line)
+    if len(section) > 0:
+        yield section
@@ -0,0 +1,92 @@
+from array import array
+from pathlib import Path
+import aoc2024.common.input as aoc_input
+from aoc2024.common.grid import GridShape, IntVector2
+
+
+def write_input(tmp_path: Path, contents: str) -> Path:
+    (tmp_path / "example.txt").write_text(contents, encoding="utf-8")
+    return tmp_path
+
+
+def test_load_bytes(tmp_path: Path):
+    parent_dir = write_input(tmp_path, "abc\ndef\n")
+    assert aoc_input.load_bytes("example", parent_dir=parent_dir) == b"abc\ndef\n"
+
+
+def test_iter_buffer_lines(tmp_path: Path):
+    parent_dir = write_input(tmp_path, "abc\n\ndef\n")
+    with aoc_input.load_mmap("example", parent_dir=parent_dir) as data:
+        lines = [bytes(line) for line in aoc_input.iter_buffer_lines(data)]
+    assert lines == [b"abc", b"", b"def"]
+    assert [bytes(line) for line in aoc_input.iter_buffer_lines(b"a\r\nb")] == [
+        b"a",
+        b"b",
+    ]
+    # searched in place, like any other buffer without a find()
+    assert [
+        bytes(line) for line in aoc_input.iter_buffer_lines(array("B", b"ab\ncd"))
+    ] == [b"ab", b"cd"]
+
+
+def test_char_grid_view(tmp_path: Path):
+    parent_dir = write_input(tmp_path, "#..\n.#.\n..#\n")
+    with aoc_input.load_mmap("example", parent_dir=parent_dir) as data:
+        view = aoc_input.CharGridView(data)
+        assert view.shape == GridShape(3, 3)
+        assert view[IntVector2(1, 1)] == ord("#")
+        assert view[2, 1] == ord(".")
+        assert view.get_packed(8) == ord("#")
+        assert view.get_if_in_bounds(IntVector2(3, 0)) is None
+        assert bytes(view.row(2)) == b"..#"
+        array = view.as_array()
+        assert array.shape == (3, 3)
+        assert array.diagonal().tobytes() == b"###"
+        del array, view
+
+
+def test_char_grid_view_without_trailing_newline():
+    view = aoc_input.CharGridView(b"ab\ncd")
+    assert view.shape == GridShape(2, 2)
+    assert view[1, 1] == ord("d")
+
+
+def test_char_grid_view_crlf():
+    for contents in (b"ab\r\ncd\r\n", b"ab\r\ncd"):
+        view = aoc_input.CharGridView(contents)
+        assert view.shape == GridShape(2, 2)
+        assert view[1, 1] == ord("d")
+        assert view.get_packed(2) == ord("c")
+        assert bytes(view.row(1)) == b"cd"
+        assert view.as_array().tobytes() == b"abcd"
+
+
+def test_iter_lines_matches_load_lines(tmp_path: Path):
+    for contents in ("\nabc\ndef\n", "abc\n\ndef\n\n", "abc", "\n\nabc\n"):
+        parent_dir = write_input(tmp_path, contents)
+        assert list(
+            aoc_input.iter_lines("example", parent_dir=parent_dir)
+        ) == aoc_input.load_lines("example", parent_dir=parent_dir)
+        assert list(
+            aoc_input.iter_lines(
+                "example",
+                parent_dir=parent_dir,
+                trim_eof_line=False,
+                trim_starting_blank_line=False,
+            )
+        ) == aoc_input.load_lines(
+            "example",
+            parent_dir=parent_dir,
+            trim_eof_line=False,
+            trim_starting_blank_line=False,
+        )
+
+
+def test_iter_sections():
+    lines = ["a", "b", "", "c", "", "", "d", "e"]
+    assert list(aoc_input.iter_sections(lines)) == [["a", "b"], ["c"], ["d", "e"]]
+    assert list(aoc_input.iter_sections(iter(lines))) == [
+        ["a", "b"],
+        ["c"],
+        ["d", "e"],
+    ]
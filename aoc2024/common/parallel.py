@@ -0,0 +1,175 @@
+"""
+A warm process pool for splitting big loops across CPU cores.
+
+Passing big inputs to a `Pool().map` pickles them again for every chunk of
+work, and starting the pool takes a while too. Here, inputs go into shared
+memory once, as flat arrays of numbers; workers attach to them by name
+for each chunk and only receive a range of indices to work on. The pool is
+started on first use and kept around for later calls, until the program
+exits.
+
+    def count_evens(arrays: Sequence[memoryview], indices: range) -> int:
+        [numbers] = arrays
+        return sum(1 for i in indices if numbers[i] % 2 == 0)
+
+    with SharedArray.copy_of(array("q", numbers)) as shared:
+        total = sum(map_ranges(count_evens, [shared], len(numbers)))
+
+Worker functions have to be defined at the top level of a module, so that
+they can be found by name. Their results can't hold on to the arrays (e.g.
+as a memoryview slice or a NumPy view), since they're detached right after.
+"""
+
+from array import array
+import atexit
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from multiprocessing.pool import Pool
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Any, Callable, Generator, Literal, Self, Sequence, cast, get_args
+
+type Typecode = Literal["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q"]
+"Same as the `array` module's integer typecodes"
+
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    "What a worker needs to find a shared array; cheap to pickle"
+
+    name: str
+    typecode: Typecode
+    length: int
+
+
+class SharedArray:
+    "A flat array of numbers in shared memory, owned by the process that created it"
+
+    def __init__(self, memory: SharedMemory, typecode: Typecode, length: int):
+        self.memory = memory
+        self.ref = SharedArrayRef(memory.name, typecode, length)
+        self.view = view_memory(memory, typecode, length)
+
+    @staticmethod
+    def copy_of(data: memoryview | Any) -> "SharedArray":
+        """
+        `data` can be anything that supports the buffer protocol and is a flat
+        array of integers, such as an `array.array` or a 1D numpy array.
+        """
+        source = memoryview(data)
+        assert source.ndim == 1, "only flat arrays are supported"
+        assert source.format in get_args(Typecode.__value__), "only integers"
+        memory = SharedMemory(create=True, size=max(1, source.nbytes))
+        view_memory(memory, "B", source.nbytes)[:] = source.cast("B")
+        return SharedArray(memory, cast(Typecode, source.format), len(source))
+
+    def close(self):
+        self.view.release()
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def view_memory(
+    memory: SharedMemory, typecode: Typecode, length: int
+) -> "memoryview[int]":
+    assert memory.buf is not None
+    return memory.buf[: length * array(typecode).itemsize].cast(typecode)
+
+
+@contextmanager
+def attach(ref: SharedArrayRef) -> Generator["memoryview[int]"]:
+    """
+    Attaches to a shared array from another process, until the end of the
+    `with` block. Workers don't keep arrays attached between chunks: once
+    the owner has unlinked one, a mapping kept around would keep its memory
+    from being freed.
+    """
+    # the creating process is in charge of cleaning it up
+    memory = SharedMemory(name=ref.name, track=False)
+    view = view_memory(memory, ref.typecode, ref.length)
+    try:
+        yield view
+    finally:
+        view.release()
+        memory.close()
+
+
+_pool: Pool | None = None
+
+
+def get_pool() -> Pool:
+    "Starts the shared pool if it isn't running yet"
+    global _pool
+    if _pool is None:
+        _pool = Pool()
+        atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool.join()
+        _pool = None
+
+
+def _run_chunk[
+    R
+](
+    func: Callable[..., R],
+    refs: Sequence[SharedArrayRef],
+    start: int,
+    stop: int,
+    args: tuple[object, ...],
+) -> R:
+    with ExitStack() as stack:
+        arrays = [stack.enter_context(attach(ref)) for ref in refs]
+        return func(arrays, range(start, stop), *args)
+
+
+def map_ranges[
+    R
+](
+    func: Callable[..., R],
+    shared: Sequence[SharedArray],
+    count: int,
+    *args: object,
+    chunks_per_worker: int = 4,
+    min_parallel: int = 1000,
+    max_chunk_size: int | None = None,
+) -> list[R]:
+    """
+    Splits `range(count)` into chunks, and calls `func(arrays, indices, *args)`
+    for each chunk in the pool, with `arrays` being memoryviews of `shared`
+    in the same order. Returns each chunk's result, in order.
+
+    With fewer than `min_parallel` indices, it's not worth the overhead,
+    so the whole range is done right here, in one call (or in chunks of
+    `max_chunk_size`, if it's set, for work that takes memory per index).
+    """
+    if count < min_parallel:
+        views = [s.view for s in shared]
+        if max_chunk_size is None or count <= max_chunk_size:
+            return [func(views, range(count), *args)]
+        return [
+            func(views, range(start, min(start + max_chunk_size, count)), *args)
+            for start in range(0, count, max_chunk_size)
+        ]
+
+    workers = os.process_cpu_count() or 1
+    chunk_size = max(1, -(-count // (workers * chunks_per_worker)))
+    if max_chunk_size is not None:
+        chunk_size = min(chunk_size, max_chunk_size)
+    refs = [s.ref for s in shared]
+    tasks = [
+        (func, refs, start, min(start + chunk_size, count), args)
+        for start in range(0, count, chunk_size)
+    ]
+    return get_pool().starmap(_run_chunk, tasks)
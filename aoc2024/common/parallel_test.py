@@ -0,0 +1,54 @@
+from array import array
+import multiprocessing
+import os
+from typing import Sequence
+import numpy as np
+from aoc2024.common.parallel import SharedArray, attach, get_pool, map_ranges
+
+
+def sum_range(arrays: Sequence[memoryview], indices: range, scale: int) -> int:
+    [numbers] = arrays
+    return sum(numbers[i] for i in indices) * scale
+
+
+def worker_pid(arrays: Sequence[memoryview], indices: range) -> int:
+    return os.getpid()
+
+
+def test_shared_array():
+    with SharedArray.copy_of(array("q", [1, -2, 3])) as shared:
+        assert shared.view.tolist() == [1, -2, 3]
+        with attach(shared.ref) as view:
+            assert view.tolist() == [1, -2, 3]
+    with SharedArray.copy_of(np.arange(5, dtype=np.uint8)) as shared:
+        assert shared.ref.typecode == "B"
+        assert shared.view.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_map_ranges():
+    numbers = array("q", range(5000))
+    with SharedArray.copy_of(numbers) as shared:
+        chunks = map_ranges(sum_range, [shared], len(numbers), 2)
+        assert len(chunks) > 1
+        assert sum(chunks) == sum(numbers) * 2
+
+        # small inputs don't bother with the pool
+        assert map_ranges(sum_range, [shared], 10, 1) == [45]
+        # but they can still be split up
+        assert map_ranges(sum_range, [shared], 10, 1, max_chunk_size=4) == [6, 22, 17]
+        chunks = map_ranges(sum_range, [shared], len(numbers), 1, max_chunk_size=100)
+        assert len(chunks) == 50
+        assert sum(chunks) == sum(numbers)
+
+
+def test_pool_stays_warm():
+    with SharedArray.copy_of(array("q", range(10))) as shared:
+        first = set(map_ranges(worker_pid, [shared], 2000))
+        pool = get_pool()
+        second = set(map_ranges(worker_pid, [shared], 2000))
+    assert get_pool() is pool
+    # any of the workers might pick up the chunks, but they're the same workers
+    pool_pids = {child.pid for child in multiprocessing.active_children()}
+    assert os.getpid() not in first
+    assert first <= pool_pids
+    assert second <= pool_pids
@@ -1,24 +1,83 @@
+import heapq
+import itertools
+from typing import Iterable
+
+
 class PriorityQueue[T]:
-    "Returns items with the lowest priority value first."
+    """
+    Returns items with the lowest priority value first. Items with the same
+    priority are returned in the order they were added.
+
+    Backed by a binary heap. Adding an item that's already in the queue
+    lowers its priority if the new one is lower (decrease-key), and otherwise
+    does nothing, so items must be hashable.
+    """
+
+    # (priority, insertion order, item) - the insertion order is unique,
+    # so items themselves never get compared
+    _heap: list[tuple[int, int, T]]
+    # (priority, insertion order) of the live heap entry for each item; any
+    # other entries for the item are stale and get skipped when they reach the top
+    _entries: dict[T, tuple[int, int]]
 
     def __init__(self, initial_item: T | None = None):
-        self.items = list[tuple[T, int]]()
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
         if initial_item is not None:
-            self.items.append((initial_item, 0))
+            self.add(initial_item, 0)
+
+    @staticmethod
+    def heapify[U](items: Iterable[tuple[U, int]]) -> "PriorityQueue[U]":
+        "Builds a queue from (item, priority) pairs in O(n)"
+        queue = PriorityQueue[U]()
+        for item, priority in items:
+            existing = queue._entries.get(item)
+            if existing is not None and existing[0] <= priority:
+                continue
+            order = next(queue._counter)
+            queue._entries[item] = (priority, order)
+            queue._heap.append((priority, order, item))
+        heapq.heapify(queue._heap)
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._entries
 
     def add(self, new_item: T, item_priority: int):
-        new_items = list[tuple[T, int]]()
-        added = False
-        for item, priority in self.items:
-            if not added and priority < item_priority:
-                new_items.append((new_item, item_priority))
-                added = True
-            new_items.append((item, priority))
-        if not added:
-            new_items.append((new_item, item_priority))
-        self.items = new_items
+        existing = self._entries.get(new_item)
+        if existing is not None and existing[0] <= item_priority:
+            return
+        order = next(self._counter)
+        self._entries[new_item] = (item_priority, order)
+        heapq.heappush(self._heap, (item_priority, order, new_item))
+
+    def remove(self, item: T):
+        "Raises KeyError if the item isn't in the queue"
+        del self._entries[item]
+
+    def _discard_stale(self):
+        heap = self._heap
+        entries = self._entries
+        while len(heap) > 0:
+            priority, order, item = heap[0]
+            if entries.get(item) == (priority, order):
+                break
+            heapq.heappop(heap)
+
+    def peek(self) -> T | None:
+        self._discard_stale()
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0][2]
 
     def pop(self) -> T | None:
-        if len(self.items) == 0:
+        self._discard_stale()
+        if len(self._heap) == 0:
             return None
-        return self.items.pop()[0]
+        item = heapq.heappop(self._heap)[2]
+        del self._entries[item]
+        return item
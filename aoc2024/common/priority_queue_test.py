@@ -0,0 +1,62 @@
+from aoc2024.common.priority_queue import PriorityQueue
+
+
+def drain[T](queue: PriorityQueue[T]) -> list[T]:
+    result = list[T]()
+    while (item := queue.pop()) is not None:
+        result.append(item)
+    return result
+
+
+def test_lowest_priority_first():
+    queue = PriorityQueue("start")
+    queue.add("c", 3)
+    queue.add("a", 1)
+    queue.add("b", 2)
+    assert len(queue) == 4
+    assert queue.peek() == "start"
+    assert drain(queue) == ["start", "a", "b", "c"]
+    assert len(queue) == 0
+    assert queue.peek() is None
+
+
+def test_ties_come_out_in_insertion_order():
+    queue = PriorityQueue[str]()
+    for item in ("x", "y", "z"):
+        queue.add(item, 5)
+    assert drain(queue) == ["x", "y", "z"]
+
+
+def test_decrease_key():
+    queue = PriorityQueue[str]()
+    queue.add("a", 10)
+    queue.add("b", 5)
+    queue.add("a", 1)
+    assert len(queue) == 2
+    assert drain(queue) == ["a", "b"]
+
+
+def test_add_ignores_worse_priority():
+    queue = PriorityQueue[str]()
+    queue.add("a", 1)
+    queue.add("b", 5)
+    queue.add("a", 10)
+    queue.add("b", 5)
+    assert len(queue) == 2
+    assert drain(queue) == ["a", "b"]
+
+
+def test_remove():
+    queue = PriorityQueue[str]()
+    queue.add("a", 1)
+    queue.add("b", 2)
+    queue.remove("a")
+    assert "a" not in queue
+    assert drain(queue) == ["b"]
+
+
+def test_heapify():
+    queue = PriorityQueue.heapify([("c", 3), ("a", 1), ("b", 2), ("a2", 1)])
+    assert drain(queue) == ["a", "a2", "b", "c"]
+    queue = PriorityQueue.heapify([("a", 1), ("b", 2), ("a", 3)])
+    assert drain(queue) == ["a", "b"]
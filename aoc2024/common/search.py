@@ -0,0 +1,124 @@
+from typing import Callable, Iterable, Iterator
+from aoc2024.common.priority_queue import PriorityQueue
+
+
+class Search[T]:
+    """
+    Dijkstra's algorithm over an implicit graph, or A* if a heuristic is provided.
+    The heuristic must never overestimate the remaining cost, and should be
+    consistent (it shouldn't drop by more than the cost of a single step)
+    for costs and predecessors to be optimal when a node is reached.
+
+    Iterating over a search yields nodes in the order they're settled;
+    `cost_so_far` and `came_from` can be inspected along the way.
+    """
+
+    cost_so_far: dict[T, int]
+    "The cheapest known cost to reach each node discovered so far"
+    came_from: dict[T, list[T]]
+    """
+    The predecessor of each node on its cheapest known path. With
+    `track_all_predecessors`, every predecessor that ties for the cheapest path.
+    """
+
+    def __init__(
+        self,
+        start: T,
+        neighbors: Callable[[T], Iterable[tuple[T, int]]],
+        /,
+        heuristic: Callable[[T], int] | None = None,
+        track_all_predecessors: bool = False,
+    ):
+        """
+        Args:
+            start (T)
+            neighbors (Callable[[T], Iterable[tuple[T, int]]]): Returns each node reachable from the given node, along with the cost of that step.
+            heuristic (Callable[[T], int], optional): Estimates the remaining cost from a node to the goal. Defaults to None (Dijkstra's algorithm).
+            track_all_predecessors (bool, optional): Records every predecessor on an optimal path, not just the first one found. Needed to find every optimal path. Defaults to False.
+        """
+        self.start = start
+        self.neighbors = neighbors
+        self.heuristic = heuristic
+        self.track_all_predecessors = track_all_predecessors
+        self.cost_so_far = {start: 0}
+        self.came_from = {start: []}
+        self._frontier = PriorityQueue[T]()
+        self._frontier.add(start, heuristic(start) if heuristic is not None else 0)
+
+    def __iter__(self) -> Iterator[T]:
+        frontier = self._frontier
+        cost_so_far = self.cost_so_far
+        came_from = self.came_from
+        neighbors = self.neighbors
+        heuristic = self.heuristic
+        track_all_predecessors = self.track_all_predecessors
+
+        while (current := frontier.pop()) is not None:
+            yield current
+
+            current_cost = cost_so_far[current]
+            for next, step_cost in neighbors(current):
+                new_cost = current_cost + step_cost
+                existing_cost = cost_so_far.get(next)
+                if existing_cost is None or new_cost < existing_cost:
+                    cost_so_far[next] = new_cost
+                    came_from[next] = [current]
+                    priority = new_cost
+                    if heuristic is not None:
+                        priority += heuristic(next)
+                    frontier.add(next, priority)
+                elif track_all_predecessors and new_cost == existing_cost:
+                    came_from[next].append(current)
+
+    def estimated_total_cost(self, node: T) -> int:
+        cost = self.cost_so_far[node]
+        if self.heuristic is not None:
+            cost += self.heuristic(node)
+        return cost
+
+    def find(self, is_goal: Callable[[T], bool]) -> T | None:
+        "Returns the first goal node reached, or None if none can be reached"
+        for current in self:
+            if is_goal(current):
+                return current
+        return None
+
+    def find_all(self, is_goal: Callable[[T], bool]) -> list[T]:
+        """
+        Returns every goal node that can be reached at the optimal cost.
+        Keeps searching until nothing left in the frontier could tie that cost,
+        so with `track_all_predecessors` every optimal path is recorded.
+        """
+        best_cost = None
+        goals = list[T]()
+        for current in self:
+            if best_cost is not None and self.estimated_total_cost(current) > best_cost:
+                # we're now finding inferior paths
+                break
+            if is_goal(current):
+                cost = self.cost_so_far[current]
+                if best_cost is None:
+                    best_cost = cost
+                if cost == best_cost:
+                    goals.append(current)
+        return goals
+
+    def path_to(self, goal: T) -> list[T]:
+        "Returns a cheapest path from the start to `goal`, including both ends"
+        path = [goal]
+        while len(previous := self.came_from[path[-1]]) > 0:
+            path.append(previous[0])
+        path.reverse()
+        return path
+
+    def nodes_on_paths_to(self, goals: Iterable[T]) -> set[T]:
+        "Returns every node on the recorded paths from the start to any of the goals"
+        result = set[T]()
+        stack = list(goals)
+        while len(stack) > 0:
+            current = stack.pop()
+            if current in result:
+                continue
+            result.add(current)
+            stack.extend(self.came_from[current])
+        return result
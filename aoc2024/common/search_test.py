@@ -0,0 +1,46 @@
+from aoc2024.common.grid import GridShape, IntVector2
+from aoc2024.common.search import Search
+
+
+def open_grid_neighbors(shape: GridShape):
+    def neighbors(coord: IntVector2):
+        return ((n, 1) for n in coord.cardinal_neighbors() if shape.is_in_bounds(n))
+
+    return neighbors
+
+
+def test_find_path():
+    shape = GridShape(4, 3)
+    goal = IntVector2(3, 2)
+    search = Search(
+        IntVector2(0, 0),
+        open_grid_neighbors(shape),
+        heuristic=lambda coord: coord.manhattan_distance(goal),
+    )
+    result = search.find(lambda coord: coord == goal)
+    assert result == goal
+    assert search.cost_so_far[goal] == 5
+    path = search.path_to(goal)
+    assert path[0] == IntVector2(0, 0)
+    assert path[-1] == goal
+    assert len(path) == 6
+
+
+def test_unreachable():
+    search = Search(0, lambda n: [(n + 1, 1)] if n < 5 else [])
+    assert search.find(lambda n: n == 10) is None
+
+
+def test_all_optimal_paths():
+    shape = GridShape(3, 3)
+    goal = IntVector2(2, 2)
+    search = Search(
+        IntVector2(0, 0),
+        open_grid_neighbors(shape),
+        heuristic=lambda coord: coord.manhattan_distance(goal),
+        track_all_predecessors=True,
+    )
+    goals = search.find_all(lambda coord: coord == goal)
+    assert goals == [goal]
+    # every cell in an open grid is on some shortest path from corner to corner
+    assert search.nodes_on_paths_to(goals) == set(shape.all_coords())
@@ -0,0 +1,231 @@
+"""Profilers that can wrap any solution (or any other function) and report where
+it spends its time or memory.
+
+    from aoc2024.profiling import profiled
+    GuardMap.part_two_result = profiled("cprofile", "profiles/guard.txt")(
+        GuardMap.part_two_result
+    )
+
+Work done in other processes (e.g. a multiprocessing Pool) isn't seen by any of them.
+"""
+
+from collections import Counter
+import cProfile
+import functools
+import io
+from pathlib import Path
+import pstats
+import sys
+import threading
+import tracemalloc
+from types import FrameType
+from typing import Callable, Protocol, Self
+
+DEFAULT_LIMIT = 25
+
+
+class Profiler(Protocol):
+    "Profiles everything run inside a `with` block"
+
+    def __enter__(self) -> Self: ...
+
+    def __exit__(self, *exc_info: object) -> None: ...
+
+    def report(self, limit: int = DEFAULT_LIMIT) -> str: ...
+
+
+class CProfileProfiler:
+    "Deterministic: sees every function call, but slows everything down"
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def __enter__(self) -> Self:
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.profile.disable()
+
+    def report(self, limit: int = DEFAULT_LIMIT) -> str:
+        output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=output)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(limit)
+        return output.getvalue()
+
+
+class TracemallocProfiler:
+    """
+    Peak memory, and which lines allocated the memory in use around the peak.
+    Snapshots are taken from a background thread whenever memory use hits a
+    new high, so the hot spots are from the closest snapshot to the real peak.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_bytes = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.snapshot_bytes = -1
+
+    def __enter__(self) -> Self:
+        tracemalloc.start()
+        self.stopping = threading.Event()
+        self.watcher = threading.Thread(target=self.watch_until_stopped, daemon=True)
+        self.watcher.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stopping.set()
+        self.watcher.join()
+        self.take_snapshot_if_higher()
+        _, self.peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    def watch_until_stopped(self):
+        while not self.stopping.wait(self.interval):
+            self.take_snapshot_if_higher()
+
+    def take_snapshot_if_higher(self):
+        current_bytes, _ = tracemalloc.get_traced_memory()
+        if current_bytes > self.snapshot_bytes:
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, threading.__file__),
+                    tracemalloc.Filter(False, __file__),
+                ]
+            )
+            self.snapshot_bytes = current_bytes
+
+    def report(self, limit: int = DEFAULT_LIMIT) -> str:
+        assert self.snapshot is not None, "profiler hasn't run yet"
+        lines = [
+            f"Peak memory: {format_bytes(self.peak_bytes)}",
+            f"Largest snapshot: {format_bytes(self.snapshot_bytes)}",
+            "",
+            f"Top {limit} lines by memory allocated at the largest snapshot:",
+        ]
+        for stat in self.snapshot.statistics("lineno")[:limit]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {format_bytes(stat.size):>10}  {stat.count:>8} blocks"
+                f"  {frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    Polls the profiled thread's stack from a background thread, so it barely
+    slows the code down, at the cost of only seeing snapshots of it.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self.self_samples = Counter[str]()
+        "Samples where a function was the one running"
+        self.total_samples = Counter[str]()
+        "Samples where a function was anywhere on the stack"
+
+    def __enter__(self) -> Self:
+        self.target_thread = threading.get_ident()
+        # otherwise the sampler only gets a turn every 5ms or so
+        self.previous_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval / 2)
+        # only count frames below the one with the `with` statement
+        self.root_frame = sys._getframe(1)  # pyright: ignore[reportPrivateUsage]
+        self.stopping = threading.Event()
+        self.sampler = threading.Thread(target=self.sample_until_stopped, daemon=True)
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stopping.set()
+        self.sampler.join()
+        sys.setswitchinterval(self.previous_switch_interval)
+
+    def sample_until_stopped(self):
+        while not self.stopping.wait(self.interval):
+            frames = sys._current_frames()  # pyright: ignore[reportPrivateUsage]
+            frame = frames.get(self.target_thread)
+            # once it's stopping, the profiled thread is only running __exit__
+            if self.stopping.is_set():
+                break
+            if frame is not None and frame.f_code.co_filename not in _OWN_FILES:
+                self.record(frame)
+
+    def record(self, frame: FrameType):
+        self.samples += 1
+        self.self_samples[describe_frame(frame)] += 1
+        on_stack = set[str]()
+        current: FrameType | None = frame
+        while current is not None and current is not self.root_frame:
+            on_stack.add(describe_frame(current))
+            current = current.f_back
+        self.total_samples.update(on_stack)
+
+    def report(self, limit: int = DEFAULT_LIMIT) -> str:
+        lines = [f"{self.samples} samples, every {self.interval * 1000:g}ms", ""]
+        for title, counts in (
+            ("Running", self.self_samples),
+            ("On the stack", self.total_samples),
+        ):
+            lines.append(f"{title}:")
+            for name, count in counts.most_common(limit):
+                lines.append(f"  {count / max(1, self.samples):>7.1%}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+_OWN_FILES = {__file__, threading.__file__}
+"Where the profiler starts and stops sampling, which isn't the profiled code's time"
+
+
+def describe_frame(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def format_bytes(size: int) -> str:
+    if size >= 1 << 20:
+        return f"{size / (1 << 20):.1f} MiB"
+    if size >= 1 << 10:
+        return f"{size / (1 << 10):.1f} KiB"
+    return f"{size} B"
+
+
+PROFILERS: dict[str, Callable[[], Profiler]] = {
+    "cprofile": CProfileProfiler,
+    "tracemalloc": TracemallocProfiler,
+    "sample": SamplingProfiler,
+}
+
+
+def profile_call[T](kind: str, func: Callable[[], T]) -> tuple[T, str]:
+    "Runs `func` under the named profiler, and returns its result along with the report"
+    with PROFILERS[kind]() as profiler:
+        result = func()
+    return result, profiler.report()
+
+
+def profiled[
+    **P, T
+](kind: str, report_path: Path | str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    "Decorator that profiles every call, overwriting the report at `report_path` each time"
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            result, report = profile_call(kind, lambda: func(*args, **kwargs))
+            write_report(Path(report_path), report)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def write_report(path: Path, report: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report, encoding="utf-8")
@@ -0,0 +1,49 @@
+from pathlib import Path
+import threading
+from aoc2024.profiling import SamplingProfiler, profile_call, profiled
+
+
+def busy_function() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def allocating_function() -> list[list[int]]:
+    return [list(range(100)) for _ in range(1000)]
+
+
+def test_cprofile():
+    result, report = profile_call("cprofile", busy_function)
+    assert result == busy_function()
+    assert "busy_function" in report
+
+
+def test_tracemalloc():
+    result, report = profile_call("tracemalloc", allocating_function)
+    assert len(result) == 1000
+    assert report.startswith("Peak memory: ")
+    assert "profiling_test.py" in report
+
+
+def test_sampling():
+    def slow() -> int:
+        return sum(busy_function() for _ in range(10))
+
+    _, report = profile_call("sample", slow)
+    assert "busy_function" in report
+    # frames above the profiler aren't counted
+    assert "test_sampling (" not in report
+
+
+def test_sampling_skips_threading():
+    # like the profiled thread waiting in Thread.join() for the sampler to stop
+    profiler = SamplingProfiler()
+    with profiler:
+        threading.Event().wait(0.05)
+    assert "threading.py" not in profiler.report()
+
+
+def test_profiled(tmp_path: Path):
+    report_path = tmp_path / "nested" / "report.txt"
+    wrapped = profiled("cprofile", report_path)(busy_function)
+    assert wrapped() == busy_function()
+    assert "busy_function" in report_path.read_text()
@@ -1,10 +1,11 @@
 import itertools
+from typing import Iterable
 import aoc2024.common.input as aoc_input
 
 type Report = list[int]
 
 
-def parse_reports(lines: list[str]) -> list[Report]:
+def parse_reports(lines: Iterable[str]) -> list[Report]:
     return [parse_report(line) for line in lines]
 
 
@@ -33,7 +34,7 @@ def is_safe(report: Report) -> bool:
     return True
 
 
-def part_one_answer(lines: list[str]) -> int:
+def part_one_answer(lines: Iterable[str]) -> int:
     reports = parse_reports(lines)
     return sum(1 if is_safe(r) else 0 for r in reports)
 
@@ -52,12 +53,11 @@ def is_safe_with_dampener(report: Report) -> bool:
     return False
 
 
-def part_two_answer(lines: list[str]) -> int:
+def part_two_answer(lines: Iterable[str]) -> int:
     reports = parse_reports(lines)
     return sum(1 if is_safe_with_dampener(r) else 0 for r in reports)
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day02input")
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day02input")))
+    print("Part Two:", part_two_answer(aoc_input.iter_lines("day02input")))
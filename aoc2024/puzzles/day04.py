@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import cast
-from aoc2024.common.grid import BasicGrid, IntVector2
+import numpy as np
+from aoc2024.common.grid import ArrayGrid, BasicGrid, IntVector2
 import aoc2024.common.input as aoc_input
 
 
@@ -26,10 +27,21 @@ def find_xmases(grid: BasicGrid[str]) -> list[FoundXmas]:
     return result
 
 
+def count_xmases(grid: ArrayGrid[np.uint8]) -> int:
+    "Vectorized equivalent of len(find_xmases(grid))"
+    is_x = grid.array == ord("X")
+    result = 0
+    for direction in IntVector2.eight_directions():
+        matches = is_x.copy()
+        for i, letter in enumerate("MAS", start=1):
+            matches &= grid.shifted(direction * i).array == ord(letter)
+        result += int(np.count_nonzero(matches))
+    return result
+
+
 def part_one_answer(lines: list[str]) -> int:
-    grid = BasicGrid.parse_char_grid(lines)
-    xmases = find_xmases(grid)
-    return len(xmases)
+    grid = ArrayGrid.parse_char_grid(lines)
+    return count_xmases(grid)
 
 
 def find_cross_mases(grid: BasicGrid[str]) -> list[IntVector2]:
@@ -61,10 +73,20 @@ def find_cross_mases(grid: BasicGrid[str]) -> list[IntVector2]:
     return result
 
 
+def count_cross_mases(grid: ArrayGrid[np.uint8]) -> int:
+    "Vectorized equivalent of len(find_cross_mases(grid))"
+    m, s = ord("M"), ord("S")
+    result = grid.array == ord("A")
+    for diagonal_start in (IntVector2(-1, -1), IntVector2(1, -1)):
+        start = grid.shifted(diagonal_start).array
+        end = grid.shifted(diagonal_start * -1).array
+        result &= ((start == m) & (end == s)) | ((start == s) & (end == m))
+    return int(np.count_nonzero(result))
+
+
 def part_two_answer(lines: list[str]) -> int:
-    grid = BasicGrid.parse_char_grid(lines)
-    results = find_cross_mases(grid)
-    return len(results)
+    grid = ArrayGrid.parse_char_grid(lines)
+    return count_cross_mases(grid)
 
 
 if __name__ == "__main__":
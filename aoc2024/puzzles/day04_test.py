@@ -1,7 +1,14 @@
 from textwrap import dedent
-from aoc2024.common.grid import BasicGrid, IntVector2
+from aoc2024.common.grid import ArrayGrid, BasicGrid, IntVector2
 import aoc2024.common.input as aoc_input
-from .day04 import find_xmases, part_one_answer, find_cross_mases, part_two_answer
+from .day04 import (
+    count_cross_mases,
+    count_xmases,
+    find_xmases,
+    part_one_answer,
+    find_cross_mases,
+    part_two_answer,
+)
 
 SAMPLE_INPUT = aoc_input.load_lines("day04sample")
 SAMPLE_GRID = BasicGrid.parse_char_grid(SAMPLE_INPUT)
@@ -77,3 +84,9 @@ def test_find_cross_mases():
 
 def test_part_two_answer():
     assert part_two_answer(SAMPLE_INPUT) == 9
+
+
+def test_vectorized_counts_match():
+    grid = ArrayGrid.parse_char_grid(SAMPLE_INPUT)
+    assert count_xmases(grid) == len(find_xmases(SAMPLE_GRID))
+    assert count_cross_mases(grid) == len(find_cross_mases(SAMPLE_GRID))
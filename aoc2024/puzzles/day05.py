@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from functools import cache, cached_property
 import re
+from typing import Iterable
 import aoc2024.common.input as aoc_input
 
 
@@ -85,10 +86,8 @@ class PuzzleInput:
     updates: list[Update]
 
     @staticmethod
-    def parse(lines: list[str]) -> "PuzzleInput":
-
-        rule_lines = lines[: lines.index("")]
-        update_lines = lines[lines.index("") + 1 :]
+    def parse(lines: Iterable[str]) -> "PuzzleInput":
+        rule_lines, update_lines = aoc_input.iter_sections(lines)
 
         rules = [OrderRule.parse(l) for l in rule_lines]
         updates = [Update.parse(l) for l in update_lines]
@@ -109,7 +108,15 @@ class PuzzleInput:
         return sum(u.middle_page for u in fixed_updates)
 
 
+def part_one_answer(lines: Iterable[str]) -> int:
+    return PuzzleInput.parse(lines).part_one_answer()
+
+
+def part_two_answer(lines: Iterable[str]) -> int:
+    return PuzzleInput.parse(lines).part_two_answer()
+
+
 if __name__ == "__main__":
-    puzzle_input = PuzzleInput.parse(aoc_input.load_lines("day05input"))
+    puzzle_input = PuzzleInput.parse(aoc_input.iter_lines("day05input"))
     print("Part One:", puzzle_input.part_one_answer())
     print("Part Two:", puzzle_input.part_two_answer())
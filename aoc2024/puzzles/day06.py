@@ -1,31 +1,89 @@
+from array import array
 from dataclasses import dataclass, replace
 from enum import Enum, auto
-import functools
-from multiprocessing import Pool
-from typing import Optional
+from functools import cached_property
+from typing import Iterable, Iterator, Optional, Sequence
 from aoc2024.common.grid import BasicGrid, Direction, GridShape, IntVector2
+from aoc2024.common.parallel import SharedArray, map_ranges
 import aoc2024.common.input as aoc_input
 
+# Clockwise, in the same order as GridShape.cardinal_offsets, so turning right
+# is just `(direction_index + 1) % 4`
+DIRECTIONS = (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT)
+DIRECTION_INDEXES = {direction: i for i, direction in enumerate(DIRECTIONS)}
+OBSTACLE_BYTES = bytes(1 if byte == ord("#") else 0 for byte in range(256))
+"For bytes.translate(): 1 for an obstacle, 0 for anything else"
+EXITS = -1
+"In a jump table, means the guard walks off the map instead of hitting anything"
+
+
+class ObstacleGrid:
+    """
+    One byte per position, 1 for an obstacle, plus optionally one extra
+    obstacle on top so that trying out a new obstacle doesn't copy the grid.
+    Works like a set of IntVector2 for `in`, `len()` and iterating.
+    """
+
+    def __init__(self, shape: GridShape, cells: bytearray, extra: int | None = None):
+        self.shape = shape
+        self.cells = cells
+        self.extra = extra
+        "Packed position of the extra obstacle"
+
+    @staticmethod
+    def from_coords(shape: GridShape, coords: Iterable[IntVector2]) -> "ObstacleGrid":
+        cells = bytearray(shape.array_size())
+        for coord in coords:
+            cells[shape.pack(coord)] = 1
+        return ObstacleGrid(shape, cells)
+
+    def with_extra(self, coord: IntVector2) -> "ObstacleGrid":
+        """
+        Shares this grid's cells if it doesn't have an extra obstacle yet,
+        so they shouldn't be changed while the new grid is in use
+        """
+        cells = self.cells
+        if self.extra is not None:
+            cells = cells.copy()
+            cells[self.extra] = 1
+        return ObstacleGrid(self.shape, cells, self.shape.pack(coord))
+
+    def contains_packed(self, packed: int) -> bool:
+        return packed == self.extra or self.cells[packed] == 1
+
+    def __contains__(self, coord: object) -> bool:
+        if not isinstance(coord, IntVector2) or not self.shape.is_in_bounds(coord):
+            return False
+        return self.contains_packed(self.shape.pack(coord))
+
+    def __len__(self) -> int:
+        count = self.cells.count(1)
+        if self.extra is not None and self.cells[self.extra] == 0:
+            count += 1
+        return count
+
+    def __iter__(self) -> Iterator[IntVector2]:
+        for packed in range(len(self.cells)):
+            if self.contains_packed(packed):
+                yield self.shape.unpack(packed)
+
 
 @dataclass(frozen=True)
 class GuardMap:
     shape: GridShape
-    obstacles: set[IntVector2]
+    obstacles: ObstacleGrid
     starting_position: IntVector2
 
     @staticmethod
     def parse(lines: list[str]):
-        basic = BasicGrid.parse_char_grid(lines)
-        obstacles = set[IntVector2]()
-        starting_position = None
-        for coord, entry in basic.all_items():
-            if entry == "#":
-                obstacles.add(coord)
-            elif entry == "^":
-                starting_position = coord
-        assert starting_position != None
+        shape = GridShape(len(lines[0]), len(lines))
+        data = "".join(lines).encode()
+        starting_index = data.find(b"^")
+        assert starting_index != -1
         return GuardMap(
-            shape=basic.shape, obstacles=obstacles, starting_position=starting_position
+            shape=shape,
+            obstacles=ObstacleGrid(shape, bytearray(data.translate(OBSTACLE_BYTES))),
+            starting_position=shape.unpack(starting_index),
         )
 
     def get_covered_positions(self):
@@ -33,61 +91,131 @@ class GuardMap:
         return set(x.position for x in path.states)
 
     def with_new_obstacle(self, new_obstacle: IntVector2) -> "GuardMap":
-        obstacles = self.obstacles.copy()
-        obstacles.add(new_obstacle)
-        return replace(self, obstacles=obstacles)
+        return replace(self, obstacles=self.obstacles.with_extra(new_obstacle))
 
     def get_path(self) -> "PathResult":
+        shape = self.shape
         past_states = list[GuardState]()
-        past_states_set = set[GuardState]()
+        # flags at `packed position * 4 + direction index`
+        visited = bytearray(shape.array_size() * 4)
         guard_state = self.starting_state()
 
-        while self.shape.is_in_bounds(guard_state.position):
-            if guard_state in past_states_set:
+        while shape.is_in_bounds(guard_state.position):
+            visited_index = (
+                shape.pack(guard_state.position) * 4
+                + DIRECTION_INDEXES[guard_state.direction]
+            )
+            if visited[visited_index]:
                 return PathResult(PathResultType.LOOPING, past_states)
             past_states.append(guard_state)
-            past_states_set.add(guard_state)
+            visited[visited_index] = 1
             next_position = guard_state.next_position()
             if next_position in self.obstacles:
-                guard_state = replace(
-                    guard_state, direction=guard_state.direction.clockwise()
+                guard_state = GuardState(
+                    guard_state.position, guard_state.direction.clockwise()
                 )
             else:
-                guard_state = replace(guard_state, position=next_position)
+                guard_state = GuardState(next_position, guard_state.direction)
 
         return PathResult(PathResultType.EXITED, past_states)
 
     def starting_state(self):
         return GuardState(self.starting_position, Direction.UP)
 
+    @cached_property
+    def jump_table(self) -> list[int]:
+        """
+        For each packed position and direction index (at `position * 4 + direction`),
+        the packed position where the guard stops because the next step is an
+        obstacle, or EXITS if they walk off the map first.
+        """
+        shape = self.shape
+        width, height = shape.width, shape.height
+        obstacles = self.obstacles
+        table = [EXITS] * (shape.array_size() * 4)
+        # each lane starts at the edge the guard is walking towards
+        lanes_by_direction = (
+            [range(x, x + width * height, width) for x in range(width)],
+            [range(y * width + width - 1, y * width - 1, -1) for y in range(height)],
+            [range(x + width * (height - 1), x - 1, -width) for x in range(width)],
+            [range(y * width, y * width + width) for y in range(height)],
+        )
+        for direction_index, lanes in enumerate(lanes_by_direction):
+            for lane in lanes:
+                stop = EXITS
+                after_obstacle = False
+                for position in lane:
+                    if obstacles.contains_packed(position):
+                        after_obstacle = True
+                        continue
+                    if after_obstacle:
+                        stop = position
+                        after_obstacle = False
+                    table[position * 4 + direction_index] = stop
+        return table
+
+    def is_looping_with_obstacle(
+        self, new_obstacle: IntVector2, start: Optional["GuardState"] = None
+    ) -> bool:
+        """
+        Same result as `with_new_obstacle(new_obstacle).get_path()`, but jumps
+        straight from turn to turn using the jump table. The new obstacle
+        isn't in the table, so each jump checks whether it cuts the jump short.
+        """
+        shape = self.shape
+        if start is None:
+            start = self.starting_state()
+        return jumps_into_loop(
+            self.jump_table,
+            shape.width,
+            shape.pack(new_obstacle),
+            shape.pack(start.position),
+            DIRECTION_INDEXES[start.direction],
+        )
+
     def get_possible_looping_obstructions(self):
         original_path = self.get_path()
         assert original_path.type == PathResultType.EXITED
-        candidates = list(
-            filter(
-                lambda s: self.shape.is_in_bounds(s.next_position()),
-                original_path.states,
-            )
-        )
+        candidates = self.get_obstruction_candidates(original_path)
 
-        with Pool() as p:
-            results = p.map(
-                functools.partial(check_looping_obstruction, self),
-                candidates,
+        shape = self.shape
+        packed_candidates = array("q")
+        for state in candidates:
+            packed_candidates.append(shape.pack(state.position))
+            packed_candidates.append(DIRECTION_INDEXES[state.direction])
+        with (
+            SharedArray.copy_of(array("q", self.jump_table)) as table,
+            SharedArray.copy_of(packed_candidates) as shared_candidates,
+        ):
+            chunks = map_ranges(
+                find_looping_obstructions,
+                [table, shared_candidates],
+                len(candidates),
+                shape.width,
             )
-        # sync version
-        # results = map(
-        #     functools.partial(check_looping_obstruction, self),
-        #     candidates,
-        # )
+        return set(shape.unpack(o) for chunk in chunks for o in chunk)
 
-        obstructions = [
-            candidate.next_position()
-            for (candidate, is_looping) in zip(candidates, results)
-            if is_looping
-        ]
-
-        return set(obstructions)
+    def get_obstruction_candidates(self, original_path: "PathResult"):
+        """
+        The guard's states just before they first step onto each new position.
+        Putting an obstruction on that position doesn't change anything up to
+        that state, so checking it can pick up from there instead of from the
+        start. Positions they've already been to (including the starting
+        position) were already checked at their first visit.
+        """
+        visited = set[IntVector2]()
+        candidates = list[GuardState]()
+        for state in original_path.states:
+            visited.add(state.position)
+            next_position = state.next_position()
+            if (
+                next_position not in visited
+                and next_position not in self.obstacles
+                and self.shape.is_in_bounds(next_position)
+            ):
+                visited.add(next_position)
+                candidates.append(state)
+        return candidates
 
     def part_one_result(self):
         return len(self.get_covered_positions())
@@ -96,12 +224,75 @@ class GuardMap:
         return len(self.get_possible_looping_obstructions())
 
 
-def check_looping_obstruction(
-    guard_map: GuardMap, starting_state: "GuardState"
+def jumps_into_loop(
+    table: Sequence[int],
+    width: int,
+    obstacle: int,
+    position: int,
+    direction_index: int,
+    visited_turns: Optional[bytearray] = None,
 ) -> bool:
-    map_with_obstacle = guard_map.with_new_obstacle(starting_state.next_position())
-    result = map_with_obstacle.get_path()
-    return result.type == PathResultType.LOOPING
+    """
+    See GuardMap.is_looping_with_obstacle; this version works on packed
+    positions and direction indexes, so that workers don't need a GuardMap.
+
+    `visited_turns` has a flag for each entry in the jump table. It can be
+    shared between calls to save allocating one each time; it's all zeroes
+    again by the time this returns.
+    """
+    if visited_turns is None:
+        visited_turns = bytearray(len(table))
+    touched = list[int]()
+    offsets = (-width, 1, width, -1)
+    obstacle_x, obstacle_y = obstacle % width, obstacle // width
+    try:
+        while True:
+            stop = table[position * 4 + direction_index]
+            offset = offsets[direction_index]
+            in_lane = (
+                position % width == obstacle_x
+                if direction_index % 2 == 0
+                else position // width == obstacle_y
+            )
+            if (
+                in_lane
+                and (obstacle - position) * offset > 0
+                and (stop == EXITS or (stop - obstacle) * offset >= 0)
+            ):
+                stop = obstacle - offset
+            if stop == EXITS:
+                return False
+            direction_index = (direction_index + 1) % 4
+            turn = stop * 4 + direction_index
+            if visited_turns[turn]:
+                return True
+            visited_turns[turn] = 1
+            touched.append(turn)
+            position = stop
+    finally:
+        for turn in touched:
+            visited_turns[turn] = 0
+
+
+def find_looping_obstructions(
+    arrays: Sequence[Sequence[int]], indices: range, width: int
+) -> list[int]:
+    """
+    Worker for GuardMap.get_possible_looping_obstructions. `arrays` are the jump
+    table, and candidates as pairs of (packed position, direction index).
+    """
+    table, candidates = arrays
+    offsets = (-width, 1, width, -1)
+    visited_turns = bytearray(len(table))
+    looping = list[int]()
+    for i in indices:
+        position, direction_index = candidates[i * 2], candidates[i * 2 + 1]
+        obstacle = position + offsets[direction_index]
+        if jumps_into_loop(
+            table, width, obstacle, position, direction_index, visited_turns
+        ):
+            looping.append(obstacle)
+    return looping
 
 
 def debug_obstruction(guard_map: GuardMap, new_obstacle: IntVector2):
@@ -177,7 +368,15 @@ class PathResult:
         return basic_grid.format_char_grid()
 
 
+def part_one_answer(lines: list[str]) -> int:
+    return GuardMap.parse(lines).part_one_result()
+
+
+def part_two_answer(lines: list[str]) -> int:
+    return GuardMap.parse(lines).part_two_result()
+
+
 if __name__ == "__main__":
     puzzle_input = GuardMap.parse(aoc_input.load_lines("day06input"))
     print("Part One", puzzle_input.part_one_result())
-    print("Part Two (kinda slow)", puzzle_input.part_two_result())
+    print("Part Two", puzzle_input.part_two_result())
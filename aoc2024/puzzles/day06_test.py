@@ -1,5 +1,5 @@
 from aoc2024.common.grid import Direction, GridShape, IntVector2
-from .day06 import GuardMap, PathResultType
+from .day06 import GuardMap, PathResultType, jumps_into_loop
 import aoc2024.common.input as aoc_input
 
 SAMPLE_INPUT = aoc_input.load_lines("day06sample")
@@ -48,3 +48,72 @@ def test_possible_looping_obstructions():
         IntVector2(7, 9),
     }
     assert set(result) == expected_results
+
+
+def test_jump_table():
+    guard_map = GuardMap.parse(SAMPLE_INPUT)
+    shape = guard_map.shape
+    start = shape.pack(guard_map.starting_position)
+    # walking up from the start, the guard stops below the obstacle at (4, 0)
+    assert guard_map.jump_table[start * 4 + 0] == shape.pack(IntVector2(4, 1))
+    # walking left, they stop next to the obstacle at (1, 6)
+    assert guard_map.jump_table[start * 4 + 3] == shape.pack(IntVector2(2, 6))
+    # walking right, they walk off the map
+    assert guard_map.jump_table[start * 4 + 1] == -1
+
+
+def test_is_looping_with_obstacle():
+    guard_map = GuardMap.parse(SAMPLE_INPUT)
+    for obstacle in guard_map.shape.all_coords():
+        if obstacle in guard_map.obstacles or obstacle == guard_map.starting_position:
+            continue
+        expected = guard_map.with_new_obstacle(obstacle).get_path().type
+        assert guard_map.is_looping_with_obstacle(obstacle) == (
+            expected == PathResultType.LOOPING
+        ), f"obstacle at {obstacle}"
+
+
+def test_obstruction_candidates():
+    guard_map = GuardMap.parse(SAMPLE_INPUT)
+    path = guard_map.get_path()
+    candidates = guard_map.get_obstruction_candidates(path)
+    positions = [c.next_position() for c in candidates]
+    assert len(set(positions)) == len(positions)
+    assert guard_map.starting_position not in positions
+    # every position the guard covers, other than where they start
+    assert set(positions) == guard_map.get_covered_positions() - {
+        guard_map.starting_position
+    }
+
+
+def test_obstacle_overlay():
+    guard_map = GuardMap.parse(SAMPLE_INPUT)
+    new_obstacle = IntVector2(3, 6)
+    with_obstacle = guard_map.with_new_obstacle(new_obstacle)
+    # the original grid is shared, not copied
+    assert with_obstacle.obstacles.cells is guard_map.obstacles.cells
+    assert new_obstacle in with_obstacle.obstacles
+    assert new_obstacle not in guard_map.obstacles
+    assert len(with_obstacle.obstacles) == 9
+    assert set(with_obstacle.obstacles) == set(guard_map.obstacles) | {new_obstacle}
+    assert IntVector2(-1, 0) not in guard_map.obstacles
+
+
+def test_visited_turns_are_reset():
+    guard_map = GuardMap.parse(SAMPLE_INPUT)
+    shape = guard_map.shape
+    visited_turns = bytearray(len(guard_map.jump_table))
+    start = shape.pack(guard_map.starting_position)
+    for obstacle, expected in ((IntVector2(3, 6), True), (IntVector2(0, 0), False)):
+        assert (
+            jumps_into_loop(
+                guard_map.jump_table,
+                shape.width,
+                shape.pack(obstacle),
+                start,
+                0,
+                visited_turns,
+            )
+            == expected
+        )
+        assert not any(visited_turns)
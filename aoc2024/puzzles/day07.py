@@ -1,11 +1,13 @@
+from collections import defaultdict
 from dataclasses import dataclass
-import itertools
-import math
-from multiprocessing import Pool
 import time
-from typing import Iterable, Literal
+from typing import Callable, Iterable, Optional, Sequence
+import numpy as np
+import numpy.typing as npt
 import aoc2024.common.input as aoc_input
 
+type IntArray = npt.NDArray[np.int64]
+
 SIMPLE_OPERATORS = ("+", "*")
 COMPLEX_OPERATORS = (
     "+",
@@ -14,6 +16,32 @@ COMPLEX_OPERATORS = (
 )
 
 
+@dataclass(frozen=True)
+class Operator:
+    symbol: str
+    apply: Callable[[int, int], int]
+    undo: Callable[[int, int], Optional[int]]
+    """
+    Given a result and the right-hand value, the left-hand value that
+    would give that result, None if there isn't one, or ANY_LEFT_VALUE if
+    every left-hand value would
+    """
+    apply_array: Optional[Callable[[IntArray, IntArray], IntArray]] = None
+    """
+    `apply` for whole arrays at once, for batch_can_be_valid(). Must never
+    give a result smaller than the left-hand value (for positive values).
+    """
+
+
+OPERATORS = dict[str, Operator]()
+ANY_LEFT_VALUE = -1
+"From `undo`, e.g. for a result of 0 times 0. Real left-hand values are never negative."
+
+
+def register_operator(operator: Operator):
+    OPERATORS[operator.symbol] = operator
+
+
 @dataclass
 class Equation:
     test_value: int
@@ -26,55 +54,174 @@ class Equation:
         values = list(map(int, values.split(" ")))
         return Equation(test_value, values)
 
-    def can_be_valid(
-        self,
-        /,
-        operators: Iterable[
-            Literal["+"] | Literal["*"] | Literal["||"]
-        ] = SIMPLE_OPERATORS,
-    ) -> bool:
-        positions = len(self.values) - 1
-        for operator_combination in itertools.product(operators, repeat=positions):
-            total = self.values[0]
-            for operator, next_value in zip(operator_combination, self.values[1:]):
-                match operator:
-                    case "+":
-                        total += next_value
-                    case "*":
-                        total *= next_value
-                    case "||":
-                        total = concat_numbers(total, next_value)
-            if total == self.test_value:
-                return True
-        return False
+    def evaluate(self, operators: Iterable[str]) -> int:
+        "Left to right, using one operator between each pair of values"
+        total = self.values[0]
+        for symbol, next_value in zip(operators, self.values[1:], strict=True):
+            total = OPERATORS[symbol].apply(total, next_value)
+        return total
+
+    def can_be_valid(self, /, operators: Iterable[str] = SIMPLE_OPERATORS) -> bool:
+        """
+        Works backwards from the test value, undoing the last value with each
+        operator in turn. Most operators can only be undone some of the time
+        (e.g. `*` only if the value divides evenly), which cuts off most
+        combinations without having to try them.
+        """
+        possible_operators = [OPERATORS[symbol] for symbol in operators]
+        values = self.values
+
+        def can_reach(target: int, last_index: int) -> bool:
+            "Whether `values[: last_index + 1]` can make `target`"
+            if last_index == 0:
+                return target == values[0]
+            last_value = values[last_index]
+            for operator in possible_operators:
+                previous = operator.undo(target, last_value)
+                if previous == ANY_LEFT_VALUE:
+                    # the values before this one always make something
+                    return True
+                if previous is not None and can_reach(previous, last_index - 1):
+                    return True
+            return False
+
+        return can_reach(self.test_value, len(values) - 1)
 
     def can_be_valid_complex(self) -> bool:
         return self.can_be_valid(operators=COMPLEX_OPERATORS)
 
 
+def digits_power(n: int) -> int:
+    "The smallest power of 10 greater than n, i.e. what to shift by to concatenate it"
+    power = 10
+    while power <= n:
+        power *= 10
+    return power
+
+
 def concat_numbers(a: int, b: int) -> int:
-    b_tens = int(math.log10(b)) + 1
-    offset_a = a * int(math.pow(10, b_tens))
-    return offset_a + b
+    return a * digits_power(b) + b
+
+
+def concat_arrays(a: IntArray, b: IntArray) -> IntArray:
+    power = np.full_like(b, 10)
+    while (needs_more := power <= b).any():
+        power[needs_more] *= 10
+    return a * power + b
+
+
+def undo_add(result: int, b: int) -> Optional[int]:
+    return result - b if result >= b else None
+
 
+def undo_multiply(result: int, b: int) -> Optional[int]:
+    if b == 0:
+        return ANY_LEFT_VALUE if result == 0 else None
+    return result // b if result % b == 0 else None
 
-def part_one_answer(lines: list[str]):
+
+def undo_concat(result: int, b: int) -> Optional[int]:
+    power = digits_power(b)
+    # result == b means the left-hand value was 0
+    return result // power if result >= b and result % power == b else None
+
+
+register_operator(Operator("+", lambda a, b: a + b, undo_add, np.add))
+register_operator(Operator("*", lambda a, b: a * b, undo_multiply, np.multiply))
+register_operator(Operator("||", concat_numbers, undo_concat, concat_arrays))
+
+INT64_LIMIT = 2**63
+DEFAULT_MAX_ELEMENTS = 1 << 22
+"About how many totals to keep in memory at once during batch_can_be_valid()"
+
+
+def batch_can_be_valid(
+    equations: Sequence[Equation],
+    operators: Sequence[str] = SIMPLE_OPERATORS,
+    max_elements: int = DEFAULT_MAX_ELEMENTS,
+) -> npt.NDArray[np.bool_]:
+    """
+    Same as calling `can_be_valid()` on each equation, but equations with the
+    same number of values are checked together, trying every combination of
+    operators at once as NumPy arrays. Returns a mask in the same order as
+    `equations`.
+
+    Totals only ever grow, so any total past the test value is clipped to
+    just past it, which keeps the arrays from overflowing along the way.
+    Groups that could still overflow (or that have a 0 value, which would
+    let a total shrink, or use operators without an `apply_array`, or would
+    be too big even one equation at a time) are checked one by one with
+    Python ints instead.
+    """
+    possible_operators = [OPERATORS[symbol] for symbol in operators]
+    result = np.zeros(len(equations), dtype=np.bool_)
+    indexes_by_length = defaultdict[int, list[int]](list)
+    for i, equation in enumerate(equations):
+        indexes_by_length[len(equation.values)].append(i)
+
+    for length, indexes in indexes_by_length.items():
+        group = [equations[i] for i in indexes]
+        combinations = len(possible_operators) ** (length - 1)
+        if combinations > max_elements or not can_batch(group, possible_operators):
+            for i, equation in zip(indexes, group):
+                result[i] = equation.can_be_valid(operators)
+            continue
+
+        chunk_size = max_elements // combinations
+        for start in range(0, len(group), chunk_size):
+            chunk = group[start : start + chunk_size]
+            result[indexes[start : start + chunk_size]] = batch_chunk(
+                chunk, possible_operators
+            )
+    return result
+
+
+def can_batch(equations: Sequence[Equation], operators: Sequence[Operator]) -> bool:
+    if any(operator.apply_array is None for operator in operators):
+        return False
+    if any(v < 1 for equation in equations for v in equation.values):
+        return False
+    # the biggest a total can get: clipped, then one more operator applied
+    clip = max(equation.test_value for equation in equations) + 1
+    largest_value = max(v for equation in equations for v in equation.values)
+    return all(
+        operator.apply(clip, largest_value) < INT64_LIMIT for operator in operators
+    )
+
+
+def batch_chunk(
+    equations: Sequence[Equation], operators: Sequence[Operator]
+) -> npt.NDArray[np.bool_]:
+    "Equations must all have the same number of values"
+    apply_arrays = [o.apply_array for o in operators if o.apply_array is not None]
+    assert len(apply_arrays) == len(operators)
+    values = np.array([equation.values for equation in equations], dtype=np.int64)
+    test_values = np.array([e.test_value for e in equations], dtype=np.int64)
+    clip = (test_values + 1)[:, np.newaxis]
+    # one row per equation, one column per combination of operators so far
+    totals = values[:, :1]
+    for column in range(1, values.shape[1]):
+        next_values = values[:, column : column + 1]
+        totals = np.concatenate(
+            [apply_array(totals, next_values) for apply_array in apply_arrays], axis=1
+        )
+        np.minimum(totals, clip, out=totals)
+    return (totals == test_values[:, np.newaxis]).any(axis=1)
+
+
+def part_one_answer(lines: Iterable[str]):
     equations = map(Equation.parse, lines)
     return sum(e.test_value for e in equations if e.can_be_valid())
 
 
-def part_two_answer(lines: list[str]):
-    equations = [Equation.parse(l) for l in lines]
-    with Pool() as p:
-        results = p.map(Equation.can_be_valid_complex, equations)
-    valid_equations = [e for (e, is_valid) in zip(equations, results) if is_valid]
-    return sum(e.test_value for e in valid_equations)
+def part_two_answer(lines: Iterable[str]):
+    equations = map(Equation.parse, lines)
+    return sum(e.test_value for e in equations if e.can_be_valid_complex())
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day07input")
-    print("Part One:", part_one_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day07input")))
     start = time.time()
-    print("Part Two:", part_two_answer(puzzle_input))
+    print("Part Two:", part_two_answer(aoc_input.iter_lines("day07input")))
     elapsed = time.time() - start
     print(f"part two took {elapsed} seconds")
@@ -1,6 +1,17 @@
 from textwrap import dedent
 import aoc2024.common.input as aoc_input
-from .day07 import Equation, concat_numbers, part_one_answer, part_two_answer
+from .day07 import (
+    COMPLEX_OPERATORS,
+    OPERATORS,
+    SIMPLE_OPERATORS,
+    Equation,
+    Operator,
+    batch_can_be_valid,
+    concat_numbers,
+    part_one_answer,
+    part_two_answer,
+    register_operator,
+)
 
 SAMPLE_INPUT = aoc_input.lines(
     dedent(
@@ -32,6 +43,15 @@ def test_can_be_valid():
     assert Equation.parse("292: 11 6 16 20").can_be_valid()
 
 
+def test_zero_values():
+    # anything times 0 is 0, whatever came before it
+    assert Equation(0, [7, 0]).can_be_valid()
+    assert Equation(0, [3, 4, 0, 0]).can_be_valid()
+    assert not Equation(1, [7, 0]).can_be_valid()
+    assert Equation(5, [0, 5]).can_be_valid_complex()
+    assert Equation(12, [7, 0, 12]).can_be_valid_complex()
+
+
 def test_part_one_answer():
     result = part_one_answer(SAMPLE_INPUT)
     assert result == 3749
@@ -47,8 +67,59 @@ def test_complex_can_be_valid():
 
 def test_concat_numbers():
     assert concat_numbers(12, 34) == 1234
+    assert concat_numbers(12, 100) == 12100
+    assert concat_numbers(5, 0) == 50
+
+
+def test_evaluate():
+    equation = Equation.parse("7290: 6 8 6 15")
+    assert equation.evaluate(["*", "||", "*"]) == 7290
+    assert equation.evaluate(["+", "+", "+"]) == 35
+
+
+def test_undo_operators():
+    for a, b in [(12, 34), (5, 10), (100, 1), (7, 7), (0, 5)]:
+        for operator in OPERATORS.values():
+            assert operator.undo(operator.apply(a, b), b) == a, operator.symbol
+
+
+def test_register_operator():
+    register_operator(Operator("-", lambda a, b: a - b, lambda result, b: result + b))
+    try:
+        assert Equation.parse("3: 10 7").can_be_valid(operators=["-"])
+        assert not Equation.parse("3: 10 7").can_be_valid()
+    finally:
+        del OPERATORS["-"]
 
 
 def test_part_two_answer():
     result = part_two_answer(SAMPLE_INPUT)
     assert result == 11387
+
+
+def test_part_two_answer_repeated():
+    result = part_two_answer(SAMPLE_INPUT * 20)
+    assert result == 11387 * 20
+
+
+def test_batch_can_be_valid():
+    equations = [Equation.parse(line) for line in SAMPLE_INPUT]
+    for operators in (SIMPLE_OPERATORS, COMPLEX_OPERATORS):
+        expected = [e.can_be_valid(operators) for e in equations]
+        assert batch_can_be_valid(equations, operators).tolist() == expected
+        # split into lots of small chunks
+        assert (
+            batch_can_be_valid(equations, operators, max_elements=9).tolist()
+            == expected
+        )
+
+
+def test_batch_can_be_valid_falls_back_to_python_ints():
+    # clipping would still overflow 64-bit ints
+    huge = Equation(2**62 + 3, [2**62, 3])
+    # a zero would let a total shrink, so clipping isn't safe
+    zero = Equation(5, [5, 0])
+    times_zero = Equation(0, [7, 0])
+    mask = batch_can_be_valid([huge, zero, times_zero], COMPLEX_OPERATORS)
+    assert mask.tolist() == [True, True, True]
+    assert batch_can_be_valid([times_zero]).tolist() == [True]
@@ -110,6 +110,14 @@ class AntennaGroup:
     antennas: set[IntVector2]
 
 
+def part_one_answer(lines: list[str]) -> int:
+    return AntennaGrid.parse(lines).part_one_answer()
+
+
+def part_two_answer(lines: list[str]) -> int:
+    return AntennaGrid.parse(lines).part_two_answer()
+
+
 if __name__ == "__main__":
     puzzle_input = aoc_input.load_lines("day08input")
     grid = AntennaGrid.parse(puzzle_input)
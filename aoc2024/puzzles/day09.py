@@ -1,22 +1,45 @@
-from dataclasses import dataclass, replace
+from array import array
+from collections.abc import Buffer
+from dataclasses import dataclass
+import heapq
 import itertools
+from typing import Iterable, Iterator
 import aoc2024.common.input as aoc_input
 
+ZERO = ord("0")
+
+
+def iter_disk_map(disk_map: str | Buffer) -> Iterator[tuple[int, int]]:
+    """
+    Yields (file size, free space after it) for each file, reading the digits
+    one at a time, so a buffer from load_mmap() never has to be read into
+    memory all at once. Anything other than a digit (like a newline) is skipped.
+    """
+    if isinstance(disk_map, str):
+        disk_map = disk_map.encode()
+    with memoryview(disk_map) as view:
+        file_size = None
+        for byte in view.cast("B"):
+            digit = byte - ZERO
+            if not 0 <= digit <= 9:
+                continue
+            if file_size is None:
+                file_size = digit
+            else:
+                yield file_size, digit
+                file_size = None
+        if file_size is not None:
+            yield file_size, 0
+
 
 @dataclass
 class FileSystem:
     blocks: list[int | None]
 
     @staticmethod
-    def parse(line: str) -> "FileSystem":
-        char_pairs = itertools.batched(line, 2, strict=False)
+    def parse(line: str | Buffer) -> "FileSystem":
         blocks = list[int | None]()
-        for i, pair in enumerate(char_pairs):
-            size = int(pair[0])
-            if len(pair) == 2:
-                free_space = int(pair[1])
-            else:
-                free_space = 0
+        for i, (size, free_space) in enumerate(iter_disk_map(line)):
             for _ in range(size):
                 blocks.append(i)
             for _ in range(free_space):
@@ -68,6 +91,95 @@ class FileSystem:
         return sum((b * i for i, b in enumerate(self.blocks) if b != None))
 
 
+def runs_checksum(runs: Iterable[tuple[int | None, int]]) -> int:
+    result = 0
+    position = 0
+    for file_id, length in runs:
+        if file_id is not None:
+            # file_id * (position + (position + 1) + ... + (position + length - 1))
+            result += file_id * (length * position + length * (length - 1) // 2)
+        position += length
+    return result
+
+
+class RunLengthFileSystem:
+    """
+    Same as FileSystem, but stores the disk map's digits, as a column of
+    file sizes and a column of the free space after each file, rather than
+    every block. File IDs are row numbers.
+    """
+
+    sizes: array[int]
+    free_spaces: array[int]
+
+    def __init__(self):
+        self.sizes = array("B")
+        self.free_spaces = array("B")
+
+    @staticmethod
+    def parse(line: str | Buffer) -> "RunLengthFileSystem":
+        file_system = RunLengthFileSystem()
+        for size, free_space in iter_disk_map(line):
+            file_system.sizes.append(size)
+            file_system.free_spaces.append(free_space)
+        return file_system
+
+    @property
+    def runs(self) -> list[tuple[int | None, int]]:
+        "(file ID, length), with None for free space, leaving out empty runs"
+        runs = list[tuple[int | None, int]]()
+        for file_id, (size, free_space) in enumerate(zip(self.sizes, self.free_spaces)):
+            if size > 0:
+                runs.append((file_id, size))
+            if free_space > 0:
+                runs.append((None, free_space))
+        return runs
+
+    def to_file_system(self, compacted: bool = False) -> FileSystem:
+        runs = self.compacted_runs() if compacted else self.runs
+        return FileSystem([file_id for file_id, length in runs for _ in range(length)])
+
+    def debug(self) -> str:
+        return self.to_file_system().debug()
+
+    def compacted_runs(self) -> Iterator[tuple[int | None, int]]:
+        """
+        The runs after filling each gap from the left with blocks from the
+        files at the right end, splitting files as needed, until the two
+        sides meet. Works in from both ends of the table without changing
+        it, so the compacted disk is never held in memory.
+        """
+        sizes, free_spaces = self.sizes, self.free_spaces
+        left, right = 0, len(sizes) - 1
+        # what's left to move of the file at `right`
+        right_size = sizes[right] if right >= 0 else 0
+        while left < right:
+            if sizes[left] > 0:
+                yield left, sizes[left]
+            gap = free_spaces[left]
+            while gap > 0:
+                if right_size == 0:
+                    right -= 1
+                    if right == left:
+                        break
+                    right_size = sizes[right]
+                    continue
+                moved = min(gap, right_size)
+                yield right, moved
+                gap -= moved
+                right_size -= moved
+            left += 1
+        if left == right and right_size > 0:
+            yield right, right_size
+        # every gap ends up at the end
+        free_space = sum(free_spaces)
+        if free_space > 0:
+            yield None, free_space
+
+    def compacted_checksum(self) -> int:
+        return runs_checksum(self.compacted_runs())
+
+
 @dataclass(eq=True, frozen=True)
 class File:
     position: int
@@ -76,67 +188,99 @@ class File:
 
 
 class FileSystemStructural:
-    "Maintains whole files"
+    """
+    Maintains whole files, as a table with a column for each field of File.
+    Rows start out sorted by position, but compacting updates positions in
+    place rather than keeping them in order.
+    """
 
-    # must remain sorted by position
-    _files: list[File]
+    ids: array[int]
+    positions: array[int]
+    sizes: array[int]
 
     def __init__(self, files: list[File]):
-        files = files.copy()
-        files.sort(key=lambda x: x.position)
-        self._files = files
+        files = sorted(files, key=lambda x: x.position)
+        self.ids = array("q", (f.id for f in files))
+        self.positions = array("q", (f.position for f in files))
+        self.sizes = array("B", (f.size for f in files))
 
     @staticmethod
-    def parse(line: str):
-        char_pairs = itertools.batched(line, 2, strict=False)
-        files = list[File]()
+    def parse(line: str | Buffer):
+        file_system = FileSystemStructural([])
         current_position = 0
-        for i, pair in enumerate(char_pairs):
-            size = int(pair[0])
-            if len(pair) == 2:
-                free_space = int(pair[1])
-            else:
-                free_space = 0
-            files.append(File(current_position, i, size))
+        for i, (size, free_space) in enumerate(iter_disk_map(line)):
+            file_system.ids.append(i)
+            file_system.positions.append(current_position)
+            file_system.sizes.append(size)
             current_position += size
             current_position += free_space
-        return FileSystemStructural(files)
+        return file_system
+
+    @staticmethod
+    def from_run_lengths(run_lengths: RunLengthFileSystem) -> "FileSystemStructural":
+        "The same as parsing the disk map again, before either one is compacted"
+        file_system = FileSystemStructural([])
+        file_system.ids = array("q", range(len(run_lengths.sizes)))
+        file_system.sizes = array("B", run_lengths.sizes)
+        current_position = 0
+        for size, free_space in zip(run_lengths.sizes, run_lengths.free_spaces):
+            file_system.positions.append(current_position)
+            current_position += size + free_space
+        return file_system
+
+    def files(self) -> Iterator[File]:
+        for id, position, size in zip(self.ids, self.positions, self.sizes):
+            yield File(position, id, size)
 
     def checksum(self):
         result = 0
-        for file in self._files:
-            positions = (x + file.position for x in range(file.size))
-            for p in positions:
-                result += p * file.id
-
+        for id, position, size in zip(self.ids, self.positions, self.sizes):
+            # id * (position + (position + 1) + ... + (position + size - 1))
+            result += id * (size * position + size * (size - 1) // 2)
         return result
 
     def compact(self):
-        starting_files = self._files.copy()
-        for file in reversed(starting_files):
-            for candidate_i, after_candidate_file in enumerate(self._files):
-                # not handled edge case: won't check for free space before the first file
-                if after_candidate_file.position >= file.position:
-                    break
-                next_file = self._files[candidate_i + 1]
-                free_space = next_file.position - (
-                    after_candidate_file.position + after_candidate_file.size
-                )
-                if free_space >= file.size:
-                    self._files.remove(file)
-                    new_file = replace(
-                        file,
-                        position=after_candidate_file.position
-                        + after_candidate_file.size,
-                    )
-                    self._files.insert(candidate_i + 1, new_file)
-                    break
+        """
+        Moves each file once, from the last to the first, into the leftmost
+        gap that fits it. Gaps are indexed by size, each size with a min-heap
+        of where they start, so finding the leftmost gap that fits only
+        means checking the top of each heap that's big enough.
+
+        A gap left behind by a moved file is never filled: every file still
+        to be moved is to its left.
+        """
+        positions, sizes = self.positions, self.sizes
+        gaps_by_size = list[list[int]]([[]])
+        for before, after in itertools.pairwise(range(len(positions))):
+            gap_start = positions[before] + sizes[before]
+            gap_size = positions[after] - gap_start
+            while len(gaps_by_size) <= gap_size:
+                gaps_by_size.append([])
+            if gap_size > 0:
+                # positions are increasing, so this is already a valid heap
+                gaps_by_size[gap_size].append(gap_start)
+
+        for i in reversed(range(len(positions))):
+            file_size = sizes[i]
+            best_size = None
+            best_start = positions[i]
+            for size in range(file_size, len(gaps_by_size)):
+                gaps = gaps_by_size[size]
+                if len(gaps) > 0 and gaps[0] < best_start:
+                    best_size = size
+                    best_start = gaps[0]
+            if best_size is None:
+                continue
+
+            heapq.heappop(gaps_by_size[best_size])
+            positions[i] = best_start
+            leftover = best_size - file_size
+            if leftover > 0:
+                heapq.heappush(gaps_by_size[leftover], best_start + file_size)
 
 
 def part_one_answer(line: str):
-    filesystem = FileSystem.parse(line)
-    filesystem.compact()
-    return filesystem.checksum()
+    return RunLengthFileSystem.parse(line).compacted_checksum()
 
 
 def part_two_answer(line: str):
@@ -146,6 +290,9 @@ def part_two_answer(line: str):
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load("day09input").rstrip()
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    with aoc_input.load_mmap("day09input") as disk_map:
+        run_length_file_system = RunLengthFileSystem.parse(disk_map)
+    print("Part One:", run_length_file_system.compacted_checksum())
+    file_system = FileSystemStructural.from_run_lengths(run_length_file_system)
+    file_system.compact()
+    print("Part Two:", file_system.checksum())
@@ -1,4 +1,16 @@
-from .day09 import FileSystem, FileSystemStructural, part_one_answer
+import random
+from .day09 import (
+    FileSystem,
+    FileSystemStructural,
+    RunLengthFileSystem,
+    iter_disk_map,
+    part_one_answer,
+)
+
+
+def test_iter_disk_map():
+    assert list(iter_disk_map("12345")) == [(1, 2), (3, 4), (5, 0)]
+    assert list(iter_disk_map(b"1234\n")) == [(1, 2), (3, 4)]
 
 
 class TestFileSystem:
@@ -33,6 +45,34 @@ class TestFileSystem:
         assert file_system.checksum() == 1928
 
 
+class TestRunLengthFileSystem:
+    def test_parse(self):
+        assert RunLengthFileSystem.parse("12345").debug() == "0..111....22222"
+        assert RunLengthFileSystem.parse("12345").runs == [
+            (0, 1),
+            (None, 2),
+            (1, 3),
+            (None, 4),
+            (2, 5),
+        ]
+
+    def test_compact_matches_file_system(self):
+        rng = random.Random(18)
+        lines = ["12345", "2333133121414131402", "90909", "25441", "252"]
+        lines += [
+            "".join(str(rng.randint(0, 9)) for _ in range(rng.randint(1, 30)))
+            for _ in range(50)
+        ]
+        for line in lines:
+            expected = FileSystem.parse(line)
+            expected.compact()
+            file_system = RunLengthFileSystem.parse(line)
+            assert file_system.to_file_system(compacted=True) == expected, line
+            assert file_system.compacted_checksum() == expected.checksum(), line
+            # and the table itself is left alone
+            assert file_system.to_file_system() == FileSystem.parse(line), line
+
+
 def test_part_one_answer():
     result = part_one_answer("2333133121414131402")
     assert result == 1928
@@ -58,7 +98,45 @@ class TestFileSystemStructural:
             == FileSystem.parse("2333133121414131402").checksum()
         )
     
+    def test_from_run_lengths(self):
+        for line in ("12345", "2333133121414131402", "90909", ""):
+            parsed = FileSystemStructural.parse(line)
+            converted = FileSystemStructural.from_run_lengths(
+                RunLengthFileSystem.parse(line)
+            )
+            assert list(converted.files()) == list(parsed.files()), line
+
     def test_compact(self):
         file_system = FileSystemStructural.parse("2333133121414131402")
         file_system.compact()
         assert file_system.checksum() == 2858
+
+    def test_checksum(self):
+        line = "2333133121414131402"
+        file_system = FileSystemStructural.parse(line)
+        assert file_system.checksum() == FileSystem.parse(line).checksum()
+        assert [f.size for f in file_system.files()][:3] == [2, 3, 1]
+
+    def test_compact_matches_moving_blocks(self):
+        rng = random.Random(9)
+        for _ in range(20):
+            line = "".join(str(rng.randint(1 - i % 2, 9)) for i in range(41))
+            file_system = FileSystemStructural.parse(line)
+            file_system.compact()
+            assert file_system.checksum() == compact_whole_files(line), line
+
+
+def compact_whole_files(line: str) -> int:
+    "The puzzle's description of part two, one block at a time"
+    blocks = FileSystem.parse(line).blocks
+    for file_id in reversed(range(max(b for b in blocks if b is not None) + 1)):
+        start = blocks.index(file_id)
+        size = blocks.count(file_id)
+        run = 0
+        for i in range(start):
+            run = run + 1 if blocks[i] is None else 0
+            if run == size:
+                blocks[i - size + 1 : i + 1] = [file_id] * size
+                blocks[start : start + size] = [None] * size
+                break
+    return FileSystem(blocks).checksum()
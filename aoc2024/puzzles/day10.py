@@ -1,8 +1,116 @@
 from collections import deque
-from functools import lru_cache
-from aoc2024.common.grid import BasicGrid, IntVector2
+from collections.abc import Buffer
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterator, Sequence
+from aoc2024.common.grid import BasicGrid, GridShape, IntVector2
+from aoc2024.common.parallel import SharedArray, map_ranges
 import aoc2024.common.input as aoc_input
 
+TRAIL_TOP = 9
+NO_HEIGHT = 255
+"A `.` in the map, which no trail can step on"
+HEIGHT_BYTES = bytes(
+    byte - ord("0") if ord("0") <= byte <= ord("9") else NO_HEIGHT
+    for byte in range(256)
+)
+"For bytes.translate(): each digit's height, NO_HEIGHT for anything else"
+MIN_PARALLEL_CELLS = 1 << 20
+"Maps smaller than this aren't worth sending to the process pool"
+MAX_BAND_CELLS = 1 << 18
+"The most cells to score trailheads in at once, which bounds the memory it takes"
+WINDOW_SIDE = 2 * TRAIL_TOP + 1
+"No 9 is more than 9 steps from a trail's start, in either direction"
+OWN_BIT = TRAIL_TOP * WINDOW_SIDE + TRAIL_TOP
+"A cell's own position in its window"
+
+
+@dataclass(frozen=True)
+class Trails:
+    "Where the trails from every cell lead, indexed by packed coordinate"
+
+    scores: list[int]
+    "How many different 9s can be reached from each cell"
+    ratings: list[int]
+    "How many different trails lead from each cell to any 9"
+
+
+type TrailLayer = tuple[dict[int, int], dict[int, int]]
+"""
+For the cells of one height that reach any 9, by packed coordinate: the set
+of 9s each one reaches (a bitset, see trail_layers()), and how many trails
+lead from it to any 9
+"""
+
+
+def trail_layers(heights: bytes, shape: GridShape) -> Iterator[TrailLayer]:
+    """
+    Works down from the 9s one height at a time, so every cell's uphill
+    neighbors are already done when it's reached, and yields each height's
+    layer from 9 down to 0. Each cell combines the sets of 9s its neighbors
+    reach and adds up their ratings. Only the layer above is kept around, so
+    this only needs memory for the cells of two heights at a time.
+
+    A set of 9s is a bitset over the square of cells up to 9 steps away,
+    centered on the cell itself, in reading order. So moving a neighbor's set
+    over to the cell is a shift by one row or one column's worth of bits, and
+    every set fits in WINDOW_SIDE² bits, however many 9s the map has.
+
+    `heights` is flat, by packed coordinate, with NO_HEIGHT for a `.`.
+    """
+    width = shape.width
+
+    def cells_at(height: int) -> Iterator[int]:
+        packed = heights.find(height)
+        while packed != -1:
+            yield packed
+            packed = heights.find(height, packed + 1)
+
+    summits = dict[int, int]()
+    ratings = dict[int, int]()
+    for packed in cells_at(TRAIL_TOP):
+        summits[packed] = 1 << OWN_BIT
+        ratings[packed] = 1
+    yield summits, ratings
+
+    for height in reversed(range(TRAIL_TOP)):
+        lower_summits = dict[int, int]()
+        lower_ratings = dict[int, int]()
+        for packed in cells_at(height):
+            reachable = 0
+            rating = 0
+            for neighbor in shape.packed_cardinal_neighbors(packed):
+                neighbor_summits = summits.get(neighbor)
+                if neighbor_summits is None:
+                    continue
+                # where the neighbor's window sits in this cell's
+                if neighbor == packed - width:
+                    reachable |= neighbor_summits >> WINDOW_SIDE
+                elif neighbor == packed + width:
+                    reachable |= neighbor_summits << WINDOW_SIDE
+                elif neighbor == packed - 1:
+                    reachable |= neighbor_summits >> 1
+                else:
+                    reachable |= neighbor_summits << 1
+                rating += ratings[neighbor]
+            # a dead end can be left out entirely
+            if reachable != 0:
+                lower_summits[packed] = reachable
+                lower_ratings[packed] = rating
+        summits, ratings = lower_summits, lower_ratings
+        yield summits, ratings
+
+
+def find_trails(heights: bytes, shape: GridShape) -> Trails:
+    "Every cell's score and rating, from trail_layers()"
+    scores = [0] * shape.array_size()
+    ratings = [0] * shape.array_size()
+    for layer_summits, layer_ratings in trail_layers(heights, shape):
+        for packed, reachable in layer_summits.items():
+            scores[packed] = reachable.bit_count()
+            ratings[packed] = layer_ratings[packed]
+    return Trails(scores, ratings)
+
 
 class TopoMap:
     grid: BasicGrid[int | None]
@@ -16,73 +124,123 @@ class TopoMap:
         grid = char_grid.map(lambda _, char: int(char) if char != "." else None)
         return TopoMap(grid)
 
+    @cached_property
+    def trails(self) -> Trails:
+        heights = bytes(NO_HEIGHT if h is None else h for h in self.grid.items)
+        return find_trails(heights, self.grid.shape)
+
     def score_trailhead(self, pos: IntVector2) -> int:
         assert self.grid[pos] == 0, "A trailhead must be a 0"
-        explored = set[IntVector2]()
-        found_trailtails = set[IntVector2]()
-        explore_queue = deque[IntVector2]()
-        explore_queue.append(pos)
-        while len(explore_queue) > 0:
-            exploring = explore_queue.popleft()
-            explored.add(exploring)
-            height = self.grid.get_if_in_bounds(exploring)
-            if height is None:
-                continue
-            if height == 9:
-                found_trailtails.add(exploring)
-                continue
-
-            next_height = height + 1
-            neighbors = (exploring + d for d in IntVector2.cardinal_directions())
-            eligible_neighbors = (
-                n for n in neighbors if self.grid.get_if_in_bounds(n) == next_height
-            )
-            explore_queue.extend(eligible_neighbors)
-
-        return len(found_trailtails)
+        return self.trails.scores[self.grid.shape.pack(pos)]
 
     def score_all_trailheads(self) -> list[tuple[IntVector2, int]]:
         result = list[tuple[IntVector2, int]]()
-        for coord, val in self.grid.all_items():
-            if val == 0:
-                score = self.score_trailhead(coord)
-                if score > 0:
-                    result.append((coord, score))
+        scores = self.trails.scores
+        for packed, val in enumerate(self.grid.items):
+            if val == 0 and scores[packed] > 0:
+                result.append((self.grid.shape.unpack(packed), scores[packed]))
         return result
 
-    @lru_cache(maxsize=2500)
     def get_rating(self, coord: IntVector2) -> int:
-        height = self.grid.get_if_in_bounds(coord)
-        if height is None:
+        if self.grid.get_if_in_bounds(coord) is None:
             return 0
-        if height == 9:
-            return 1
+        return self.trails.ratings[self.grid.shape.pack(coord)]
+
 
-        next_height = height + 1
-        neighbors = (coord + d for d in IntVector2.cardinal_directions())
-        eligible_neighbors = [
-            n for n in neighbors if self.grid.get_if_in_bounds(n) == next_height
-        ]
+@dataclass(frozen=True)
+class HeightMap:
+    """
+    A map with one byte per cell, for maps too big for TopoMap's grid of
+    Python objects. Trailheads are scored in bands of rows, spread across the
+    process pool: no trail goes more than 9 rows away from its trailhead, so
+    each band only needs to see the 9 rows above and below it. Bands are kept
+    to about MAX_BAND_CELLS cells, however big the map is.
+    """
 
-        return sum(self.get_rating(n) for n in eligible_neighbors)
+    shape: GridShape
+    heights: bytes
+    "Flat, by packed coordinate, with NO_HEIGHT for a `.`"
+
+    @staticmethod
+    def parse(puzzle_input: list[str] | Buffer) -> "HeightMap":
+        "Accepts either a list of lines or the raw bytes of a file (such as from load_mmap())"
+        if isinstance(puzzle_input, list):
+            lines = (line.encode("ascii") for line in puzzle_input)
+        else:
+            lines = (
+                line.tobytes() for line in aoc_input.iter_buffer_lines(puzzle_input)
+            )
+        heights = bytearray()
+        width = None
+        height = 0
+        for line in lines:
+            if width is None:
+                width = len(line)
+            assert len(line) == width, f"mismatched width for line {height}"
+            heights += line.translate(HEIGHT_BYTES)
+            height += 1
+        return HeightMap(GridShape(width or 0, height), bytes(heights))
+
+    def trail_totals(
+        self,
+        min_parallel_cells: int = MIN_PARALLEL_CELLS,
+        max_band_cells: int = MAX_BAND_CELLS,
+    ) -> tuple[int, int]:
+        "The sums of every trailhead's score and rating"
+        width = self.shape.width
+        with SharedArray.copy_of(self.heights) as shared:
+            chunks = map_ranges(
+                sum_trails,
+                [shared],
+                self.shape.height,
+                width,
+                # fewer, bigger bands, so the overlap is a smaller share of the work
+                chunks_per_worker=2,
+                min_parallel=-(-min_parallel_cells // max(1, width)),
+                # but not so big that they take up too much memory
+                max_chunk_size=max(2 * TRAIL_TOP, max_band_cells // max(1, width)),
+            )
+        return sum(score for score, _ in chunks), sum(rating for _, rating in chunks)
+
+
+def sum_trails(
+    arrays: Sequence[Sequence[int]], rows: range, width: int
+) -> tuple[int, int]:
+    """
+    Worker for HeightMap.trail_totals. Sums the scores and ratings of the
+    trailheads in `rows`, looking at the surrounding rows that their trails
+    could reach.
+    """
+    [heights] = arrays
+    top = max(0, rows.start - TRAIL_TOP)
+    bottom = min(len(heights) // max(1, width), rows.stop + TRAIL_TOP)
+    band = bytes(heights[top * width : bottom * width])
+    # only the last layer, for the trailheads, without holding onto the others
+    layers = deque(trail_layers(band, GridShape(width, bottom - top)), maxlen=1)
+    trailhead_summits, trailhead_ratings = layers.pop()
+    first = (rows.start - top) * width
+    last = (rows.stop - top) * width
+    score = 0
+    rating = 0
+    for packed, reachable in trailhead_summits.items():
+        if first <= packed < last:
+            score += reachable.bit_count()
+            rating += trailhead_ratings[packed]
+    return score, rating
 
 
 def part_one_answer(lines: list[str]) -> int:
-    topomap = TopoMap.parse(lines)
-    trailheads = topomap.score_all_trailheads()
-    return sum(score for _, score in trailheads)
+    score, _ = HeightMap.parse(lines).trail_totals()
+    return score
 
 
 def part_two_answer(lines: list[str]) -> int:
-    topomap = TopoMap.parse(lines)
-    result = 0
-    for coord, val in topomap.grid.all_items():
-        if val == 0:
-            result += topomap.get_rating(coord)
-    return result
+    _, rating = HeightMap.parse(lines).trail_totals()
+    return rating
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day10input")
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    with aoc_input.load_mmap("day10input") as puzzle_input:
+        score, rating = HeightMap.parse(puzzle_input).trail_totals()
+    print("Part One:", score)
+    print("Part Two:", rating)
@@ -1,7 +1,7 @@
 from textwrap import dedent
-from aoc2024.common.grid import IntVector2
+from aoc2024.common.grid import GridShape, IntVector2
 import aoc2024.common.input as aoc_input
-from .day10 import TopoMap, part_one_answer, part_two_answer
+from .day10 import HeightMap, TopoMap, part_one_answer, part_two_answer
 
 SAMPLE_INPUT = aoc_input.load_lines("day10sample")
 
@@ -101,3 +101,29 @@ def test_trailhead_rating():
 
 def test_part_two_answer():
     assert part_two_answer(SAMPLE_INPUT) == 81
+
+
+def test_trails_far_apart():
+    # the 9s are more than 9 rows apart
+    topomap = TopoMap.parse(list("0123456789876543210123456789"))
+    assert topomap.trails.scores[0] == 1
+    assert topomap.trails.scores[18] == 2
+    assert topomap.trails.ratings[18] == 2
+    assert part_one_answer(list("0123456789876543210123456789")) == 3
+
+
+def test_height_map():
+    height_map = HeightMap.parse(SAMPLE_INPUT)
+    assert height_map.shape == GridShape(8, 8)
+    assert height_map.heights[:8] == bytes([8, 9, 0, 1, 0, 1, 2, 3])
+    assert height_map.trail_totals() == (36, 81)
+    raw_input = ("\n".join(SAMPLE_INPUT) + "\n").encode()
+    assert HeightMap.parse(raw_input) == height_map
+
+
+def test_height_map_in_bands():
+    # some trails cross over into the next band of rows
+    lines = list("....." + "0123456789876543210123456789" * 4)
+    assert HeightMap.parse(lines).trail_totals(min_parallel_cells=1) == (12, 12)
+    # bands as small as they go, without the pool too
+    assert HeightMap.parse(lines).trail_totals(max_band_cells=1) == (12, 12)
@@ -1,21 +1,36 @@
-from functools import cache
+from bisect import bisect_right
+from collections import Counter, OrderedDict
 import itertools
+import json
+from pathlib import Path
 from typing import Callable, Iterable, Sequence
 import aoc2024.common.input as aoc_input
 
+TABLE_PATH = aoc_input.PUZZLES_DIR / "day11table.json"
+"Where __main__ keeps the table of stone counts between runs"
+
 
 def parse(line: str):
     return tuple(int(s) for s in line.split(" "))
 
 
+_powers_of_ten = [1]
+
+
+def count_digits(label: int) -> int:
+    "Without converting to a string; 0 has one digit"
+    while _powers_of_ten[-1] <= label:
+        _powers_of_ten.append(_powers_of_ten[-1] * 10)
+    return max(1, bisect_right(_powers_of_ten, label))
+
+
 def stone_reaction(label: int) -> tuple[int, ...]:
     if label == 0:
         return (1,)
 
-    as_str = str(label)
-    if len(as_str) % 2 == 0:
-        midpoint = len(as_str) // 2
-        return (int(as_str[0:midpoint]), int(as_str[midpoint:]))
+    digits = count_digits(label)
+    if digits % 2 == 0:
+        return divmod(label, _powers_of_ten[digits // 2])
 
     return (label * 2024,)
 
@@ -28,16 +43,190 @@ def flatmap[T](func: Callable[[T], Sequence[T]], *iterable: Iterable[T]):
     return itertools.chain.from_iterable(map(func, *iterable))
 
 
-def count_after_blinks(stones: tuple[int, ...], times: int) -> int:
-    return sum(count_single_stone_after_blinks(s, times) for s in stones)
+DEFAULT_MAX_CACHED = 1 << 16
+"How many counts a StoneCounter keeps by default before dropping the oldest"
+
+
+class StoneCounter:
+    """
+    Counts stones without keeping track of the stones themselves, only how
+    many there are with each label. The count for each (label, blinks) it's
+    asked about goes into a table, which can be saved and loaded between runs.
+    """
+
+    table: OrderedDict[tuple[int, int], int]
+    "How many stones a stone with `label` turns into after `blinks` blinks"
+    max_cached: int | None
+    "If set, the least recently used counts are dropped beyond this many"
+
+    def __init__(self, max_cached: int | None = DEFAULT_MAX_CACHED):
+        self.table = OrderedDict()
+        self.max_cached = max_cached
+
+    def lookup(self, label: int, blinks: int) -> int | None:
+        key = (label, blinks)
+        if key not in self.table:
+            return None
+        self.table.move_to_end(key)
+        return self.table[key]
+
+    def store(self, label: int, blinks: int, count: int):
+        self.table[(label, blinks)] = count
+        self.table.move_to_end((label, blinks))
+        if self.max_cached is not None:
+            while len(self.table) > self.max_cached:
+                self.table.popitem(last=False)
+
+    def count(self, stones: Iterable[int], times: int) -> int:
+        stones = Counter(stones)
+        counts = dict[int, int]()
+        missing = list[int]()
+        for label in stones:
+            count = self.lookup(label, times)
+            if count is None:
+                missing.append(label)
+            else:
+                counts[label] = count
+        if len(missing) > 0:
+            for label, count in zip(missing, count_each(missing, times)):
+                self.store(label, times, count)
+                counts[label] = count
+        return sum(n * counts[label] for label, n in stones.items())
+
+    def save(self, path: Path):
+        # hex, because the counts can get too big for int() to parse as decimal
+        rows = [
+            [label, blinks, hex(count)] for (label, blinks), count in self.table.items()
+        ]
+        path.write_text(json.dumps(rows), encoding="utf-8")
+
+    @staticmethod
+    def load(path: Path, max_cached: int | None = DEFAULT_MAX_CACHED) -> "StoneCounter":
+        counter = StoneCounter(max_cached)
+        for label, blinks, count in json.loads(path.read_text(encoding="utf-8")):
+            counter.store(label, blinks, int(count, 16))
+        return counter
+
+
+def count_each(labels: list[int], times: int) -> list[int]:
+    """
+    How many stones each of `labels` turns into after `times` blinks, in one
+    pass per blink over every label that can show up. A label's count for `b`
+    blinks is the sum of its children's counts for `b - 1`, so only the
+    previous blink's counts need to be kept.
+    """
+    # Every label that shows up, in the order they first show up, and where
+    # each blink's new labels start. A label that first shows up at blink `b`
+    # only ever needs counts for up to `times - b` more blinks.
+    order = list(dict.fromkeys(labels))
+    indexes = {label: i for i, label in enumerate(order)}
+    first_blink_ends = [len(order)]
+    start = 0
+    for _ in range(times):
+        for label in order[start:]:
+            for child in stone_reaction(label):
+                if child not in indexes:
+                    indexes[child] = len(order)
+                    order.append(child)
+        start = first_blink_ends[-1]
+        if len(order) == start:
+            break
+        first_blink_ends.append(len(order))
+
+    # each label's children, as indexes; a label with only one child gets the
+    # index past the end, whose count is always zero
+    zero = len(order)
+    first_children = list[int]()
+    second_children = list[int]()
+    for label in order[:start]:
+        children = stone_reaction(label)
+        first_children.append(indexes[children[0]])
+        second_children.append(indexes[children[1]] if len(children) == 2 else zero)
+
+    # counts[i] is for `blinks` blinks, going up from zero blinks
+    counts = [1] * len(order) + [0]
+    for blinks in range(1, times + 1):
+        first_blink = min(times - blinks, len(first_blink_ends) - 1)
+        end = first_blink_ends[first_blink]
+        counts[:end] = [
+            counts[first] + counts[second]
+            for first, second in zip(first_children[:end], second_children[:end])
+        ]
+    return [counts[indexes[label]] for label in labels]
+
+
+def closed_labels(stones: Iterable[int]) -> list[int]:
+    "Every label that can ever show up from `stones`, in the order they first show up"
+    labels = list(dict.fromkeys(stones))
+    seen = set(labels)
+    for label in labels:
+        for child in stone_reaction(label):
+            if child not in seen:
+                seen.add(child)
+                labels.append(child)
+    return labels
+
+
+type SparseMatrix = list[dict[int, int]]
+"Row i maps each column j to the entry at (i, j), leaving out zeros"
+
+
+def transition_matrix(labels: list[int]) -> SparseMatrix:
+    """
+    Row i counts how many stones of each label a stone labelled `labels[i]`
+    turns into after one blink. `labels` must be closed, like from closed_labels().
+    """
+    indexes = {label: i for i, label in enumerate(labels)}
+    return [
+        dict(Counter(indexes[child] for child in stone_reaction(label)))
+        for label in labels
+    ]
+
+
+def multiply(
+    a: SparseMatrix, b: SparseMatrix, modulus: int | None = None
+) -> SparseMatrix:
+    result: SparseMatrix = []
+    for a_row in a:
+        row = dict[int, int]()
+        for k, a_entry in a_row.items():
+            for j, b_entry in b[k].items():
+                row[j] = row.get(j, 0) + a_entry * b_entry
+        if modulus is not None:
+            row = {j: entry % modulus for j, entry in row.items() if entry % modulus}
+        result.append(row)
+    return result
+
+
+def count_by_squaring(
+    stones: Iterable[int], times: int, modulus: int | None = None
+) -> int:
+    """
+    Same as count_after_blinks(), but takes O(log times) matrix products
+    instead of a pass per blink. Each product costs up to the cube of the
+    number of closed labels though, and the powers fill in quickly, so this
+    only beats StoneCounter when the closed set is small. With a `modulus`,
+    the count is modulo that, which keeps the entries from growing with `times`.
+    """
+    # it's gone over twice
+    stones = list(stones)
+    labels = closed_labels(stones)
+    indexes = {label: i for i, label in enumerate(labels)}
+    # as a single-row matrix
+    counts = [dict(Counter(indexes[label] for label in stones))]
+    power = transition_matrix(labels)
+    while times > 0:
+        if times & 1:
+            counts = multiply(counts, power, modulus)
+        times >>= 1
+        if times > 0:
+            power = multiply(power, power, modulus)
+    total = sum(counts[0].values())
+    return total if modulus is None else total % modulus
 
 
-@cache
-def count_single_stone_after_blinks(label: int, times: int) -> int:
-    if times == 0:
-        return 1
-    split = stone_reaction(label)
-    return sum(count_single_stone_after_blinks(s, times - 1) for s in split)
+def count_after_blinks(stones: tuple[int, ...], times: int) -> int:
+    return StoneCounter().count(stones, times)
 
 
 def part_one_answer(puzzle_input: str) -> int:
@@ -52,5 +241,11 @@ def part_two_answer(puzzle_input: str) -> int:
 
 if __name__ == "__main__":
     puzzle_input = aoc_input.load("day11input")
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    stones = parse(puzzle_input)
+    if TABLE_PATH.exists():
+        stone_counter = StoneCounter.load(TABLE_PATH)
+    else:
+        stone_counter = StoneCounter()
+    print("Part One:", stone_counter.count(stones, 25))
+    print("Part Two:", stone_counter.count(stones, 75))
+    stone_counter.save(TABLE_PATH)
@@ -1,4 +1,19 @@
-from .day11 import blink, count_after_blinks
+from pathlib import Path
+from .day11 import (
+    StoneCounter,
+    blink,
+    closed_labels,
+    count_after_blinks,
+    count_by_squaring,
+    count_each,
+    count_digits,
+)
+
+
+def blink_times(stones: tuple[int, ...], times: int) -> tuple[int, ...]:
+    for _ in range(times):
+        stones = blink(stones)
+    return stones
 
 
 def test_blink():
@@ -6,7 +21,64 @@ def test_blink():
     assert blink(initial) == (1, 2024, 1, 0, 9, 9, 2021976)
 
 
+def test_count_digits():
+    assert [count_digits(n) for n in (0, 1, 9, 10, 99, 100, 10**30)] == [
+        1,
+        1,
+        1,
+        2,
+        2,
+        3,
+        31,
+    ]
+
+
 def test_count_after_blinks():
     initial = (125, 17)
     assert count_after_blinks(initial, 6) == 22
     assert count_after_blinks(initial, 25) == 55312
+
+
+def test_stone_counter_bounded():
+    unbounded = StoneCounter(max_cached=None)
+    bounded = StoneCounter(max_cached=2)
+    assert bounded.count((125, 17, 125), 100) == unbounded.count((125, 17, 125), 100)
+    # only the counts that were asked for are kept, not the ones along the way
+    assert list(unbounded.table) == [(125, 100), (17, 100)]
+    assert bounded.count((7,), 10) == count_after_blinks((7,), 10)
+    assert list(bounded.table) == [(17, 100), (7, 10)]
+    assert bounded.count((125, 17), 25) == 55312
+
+
+def test_count_each():
+    labels = [125, 17, 0, 125]
+    for times in (0, 1, 6, 20):
+        expected = [len(blink_times((label,), times)) for label in labels]
+        assert count_each(labels, times) == expected
+
+
+def test_stone_counter_save_and_load(tmp_path: Path):
+    path = tmp_path / "table.json"
+    stone_counter = StoneCounter()
+    expected = stone_counter.count((125, 17), 200)
+    stone_counter.save(path)
+    loaded = StoneCounter.load(path)
+    assert loaded.table == stone_counter.table
+    assert loaded.count((125, 17), 200) == expected
+
+
+def test_closed_labels():
+    labels = closed_labels((0,))
+    assert labels[:4] == [0, 1, 2024, 20]
+    assert set(labels) == set(c for label in labels for c in blink((label,)))
+
+
+def test_count_by_squaring():
+    initial = (125, 17)
+    assert count_by_squaring(initial, 6) == 22
+    assert count_by_squaring(initial, 25) == 55312
+    assert count_by_squaring(initial, 150) == StoneCounter().count(initial, 150)
+    modulus = 1_000_003
+    expected = StoneCounter().count(initial, 150) % modulus
+    assert count_by_squaring(initial, 150, modulus) == expected
+    assert count_by_squaring((stone for stone in initial), 6) == 22
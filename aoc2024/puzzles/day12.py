@@ -1,143 +1,155 @@
-from collections import deque
+from array import array
 from dataclasses import dataclass
-from functools import cached_property
-from aoc2024.common.grid import BasicGrid, Direction, IntVector2
+import numpy as np
+import numpy.typing as npt
+from aoc2024.common.grid import BasicGrid, GridShape
 import aoc2024.common.input as aoc_input
 
+type IntArray = npt.NDArray[np.int64]
+
 
 @dataclass(eq=True, frozen=True)
 class Region:
     plant: str
-    coords: frozenset[IntVector2]
-
-    @cached_property
-    def perimeter(self) -> int:
-        result = 0
-        for coord in self.coords:
-            for neighbor in coord.cardinal_neighbors():
-                if neighbor not in self.coords:
-                    result += 1
-        return result
-
-    @cached_property
-    def price_to_fence(self) -> int:
-        return len(self.coords) * self.perimeter
+    area: int
+    perimeter: int
+    sides: int
+    "The same as the number of corners"
 
-    @cached_property
-    def sides(self) -> int:
-        solver = EdgesSolver(self)
-        return len(solver.get_edges())
+    @property
+    def price_to_fence(self) -> int:
+        return self.area * self.perimeter
 
-    @cached_property
+    @property
     def bulk_price_to_fence(self) -> int:
-        return len(self.coords) * self.sides
-
-
-class RegionSolver:
-    def __init__(self, grid: BasicGrid[str]):
-        self.grid = grid
-        self.discovered = dict[IntVector2, Region]()
-
-    def get_regions(self) -> set[Region]:
-        for coord in self.grid.shape.all_coords():
-            self.discover(coord)
-        return set(self.discovered.values())
-
-    def discover(self, coord: IntVector2):
-        if coord in self.discovered:
-            return
-
-        plant = self.grid[coord]
-        queue = deque([coord])
-        found = set[IntVector2]()
-        while len(queue) > 0:
-            exploring = queue.popleft()
-
-            if self.grid.get_if_in_bounds(exploring) != plant:
-                continue
-
-            if exploring in found:
-                continue
-            found.add(exploring)
-
-            queue.extend(exploring.cardinal_neighbors())
-
-        region = Region(plant, frozenset(found))
-        for region_coord in found:
-            self.discovered[region_coord] = region
+        return self.area * self.sides
 
 
-@dataclass(frozen=True, eq=True)
-class EdgeSegment:
-    coord: IntVector2
-    normal: Direction
+@dataclass(frozen=True)
+class RegionMap:
+    shape: GridShape
+    labels: array[int]
+    "For each packed coordinate, the index of its region in `regions`"
+    regions: list[Region]
 
+    def as_array(self) -> IntArray:
+        "A zero-copy [y, x] NumPy view of the labels"
+        return np.frombuffer(self.labels, dtype=np.int64).reshape(
+            self.shape.height, self.shape.width
+        )
 
-@dataclass(frozen=True, eq=True)
-class Edge:
-    top_left_coord: IntVector2
-    normal: Direction
-    length: int
-
-
-class EdgesSolver:
-    def __init__(self, region: Region):
-        self.region = region
-        self.discovered = dict[EdgeSegment, Edge]()
-
-    def get_edges(self):
-        for coord in self.region.coords:
-            for normal in Direction:
-                self.discover(EdgeSegment(coord, normal))
-        return set(self.discovered.values())
-
-    def discover(self, edge_segment: EdgeSegment):
-        if edge_segment in self.discovered:
-            return
-
-        queue = deque([edge_segment])
-        found = set[EdgeSegment]()
-        while len(queue) > 0:
-            exploring = queue.popleft()
-
-            if exploring.coord not in self.region.coords:
-                continue
-            if exploring.coord + exploring.normal.to_vector() in self.region.coords:
-                # not an edge pointing outwards
-                continue
-
-            if exploring in found:
-                continue
-            found.add(exploring)
-
-            match exploring.normal:
-                case Direction.UP | Direction.DOWN:
-                    right = Direction.RIGHT.to_vector()
-                    queue.append(EdgeSegment(exploring.coord + right, exploring.normal))
-                    queue.append(EdgeSegment(exploring.coord - right, exploring.normal))
-                case Direction.LEFT | Direction.RIGHT:
-                    down = Direction.DOWN.to_vector()
-                    queue.append(EdgeSegment(exploring.coord + down, exploring.normal))
-                    queue.append(EdgeSegment(exploring.coord - down, exploring.normal))
-
-        if len(found) == 0:
-            return
 
-        top_left = IntVector2(
-            min(s.coord.x for s in found), min(s.coord.y for s in found)
-        )
-        region = Edge(top_left, edge_segment.normal, length=len(found))
-        for region_coord in found:
-            self.discovered[region_coord] = region
+def find_root(parents: list[int], label: int) -> int:
+    while parents[label] != label:
+        # path halving: point every other label at its grandparent
+        parents[label] = parents[parents[label]]
+        label = parents[label]
+    return label
+
+
+def label_regions(grid: BasicGrid[str]) -> RegionMap:
+    """
+    Labels every cell with a single scan in reading order. A cell joins the
+    region of the matching cell above or to its left, or starts a provisional
+    region of its own; when both match but have different provisional
+    regions, those are merged with union-find. Each provisional region
+    keeps adding up area and perimeter as it goes, and they're totalled up
+    per merged region at the end. Sides are counted afterwards for every
+    region at once, by count_corners().
+    """
+    items = grid.items
+    shape = grid.shape
+    width, height = shape.width, shape.height
+
+    def same(x: int, y: int, plant: str) -> bool:
+        return 0 <= x < width and 0 <= y < height and items[y * width + x] == plant
+
+    labels = array("q", bytes(8 * shape.array_size()))
+    parents = list[int]()
+    plants = list[str]()
+    areas = list[int]()
+    perimeters = list[int]()
+    for y in range(height):
+        for x in range(width):
+            packed = y * width + x
+            plant = items[packed]
+            up = same(x, y - 1, plant)
+            left = same(x - 1, y, plant)
+            if up:
+                label = labels[packed - width]
+                if left:
+                    up_root = find_root(parents, label)
+                    left_root = find_root(parents, labels[packed - 1])
+                    if up_root != left_root:
+                        parents[left_root] = up_root
+            elif left:
+                label = labels[packed - 1]
+            else:
+                label = len(parents)
+                parents.append(label)
+                plants.append(plant)
+                areas.append(0)
+                perimeters.append(0)
+            labels[packed] = label
+
+            areas[label] += 1
+            # a shared edge takes one side off of both cells, and this is
+            # the second of the two cells to be scanned
+            perimeters[label] += 4 - 2 * up - 2 * left
+
+    region_indexes = dict[int, int]()
+    totals = list[list[int]]()
+    for label in range(len(parents)):
+        root = find_root(parents, label)
+        if root not in region_indexes:
+            region_indexes[root] = len(totals)
+            totals.append([0, 0])
+        total = totals[region_indexes[root]]
+        total[0] += areas[label]
+        total[1] += perimeters[label]
+    for packed, label in enumerate(labels):
+        labels[packed] = region_indexes[find_root(parents, label)]
+    label_array = np.frombuffer(labels, dtype=np.int64).reshape(height, width)
+    sides = count_corners(label_array, len(totals))
+    regions = [
+        Region(plants[root], area, perimeter, int(region_sides))
+        for root, (area, perimeter), region_sides in zip(region_indexes, totals, sides)
+    ]
+    return RegionMap(shape, labels, regions)
+
+
+def count_corners(labels: IntArray, region_count: int) -> IntArray:
+    """
+    How many corners each region has, which is the same as how many sides.
+    Looks at every 2x2 window of cells (including ones hanging off the edge
+    of the map) and counts a corner for each cell in the window that has one
+    at the window's middle point.
+    """
+    padded = np.pad(labels, 1, constant_values=-1)
+    top_left, top_right = padded[:-1, :-1], padded[:-1, 1:]
+    bottom_left, bottom_right = padded[1:, :-1], padded[1:, 1:]
+    corners = np.zeros(region_count, dtype=np.int64)
+    for cell, beside, above_or_below, diagonal in (
+        (top_left, top_right, bottom_left, bottom_right),
+        (top_right, top_left, bottom_right, bottom_left),
+        (bottom_left, bottom_right, top_left, top_right),
+        (bottom_right, bottom_left, top_right, top_left),
+    ):
+        # like the top left corner of a square
+        convex = (cell != beside) & (cell != above_or_below)
+        # like the inside corner of an L
+        concave = (cell == beside) & (cell == above_or_below) & (cell != diagonal)
+        is_corner = (cell >= 0) & (convex | concave)
+        corners += np.bincount(cell[is_corner], minlength=region_count)
+    return corners
 
 
 def parse(lines: list[str]):
     return BasicGrid.parse_char_grid(lines)
 
 
-def get_regions(grid: BasicGrid[str]):
-    solver = RegionSolver(grid)
-    return solver.get_regions()
+def get_regions(grid: BasicGrid[str]) -> list[Region]:
+    return label_regions(grid).regions
 
 
 def part_one_answer(lines: list[str]) -> int:
@@ -1,12 +1,11 @@
 from textwrap import dedent
-from aoc2024.common.grid import IntVector2
 import aoc2024.common.input as aoc_input
 from .day12 import (
-    EdgesSolver,
     Region,
+    count_corners,
     get_regions,
+    label_regions,
     parse,
-    RegionSolver,
     part_one_answer,
     part_two_answer,
 )
@@ -53,39 +52,44 @@ LARGE_INPUT = aoc_input.lines(
 
 
 def test_simple_plot():
-    solver = RegionSolver(parse(SIMPLE_INPUT))
-    regions = solver.get_regions()
-    assert len(regions) == 5
-    assert (
-        Region(
-            "A",
-            frozenset(
-                [IntVector2(0, 0), IntVector2(1, 0), IntVector2(2, 0), IntVector2(3, 0)]
-            ),
-        )
-        in regions
-    )
-    assert (
-        Region(
-            "B",
-            frozenset(
-                [IntVector2(0, 1), IntVector2(1, 1), IntVector2(0, 2), IntVector2(1, 2)]
-            ),
-        )
-        in regions
-    )
-    assert (
-        Region(
-            "C",
-            frozenset(
-                [IntVector2(2, 1), IntVector2(2, 2), IntVector2(3, 2), IntVector2(3, 3)]
-            ),
+    region_map = label_regions(parse(SIMPLE_INPUT))
+    assert len(region_map.regions) == 5
+    assert region_map.regions[0] == Region("A", area=4, perimeter=10, sides=4)
+    assert region_map.regions[1] == Region("B", area=4, perimeter=8, sides=4)
+    assert region_map.regions[2] == Region("C", area=4, perimeter=10, sides=8)
+    assert list(region_map.labels) == [
+        *(0, 0, 0, 0),
+        *(1, 1, 2, 3),
+        *(1, 1, 2, 2),
+        *(4, 4, 4, 2),
+    ]
+
+    regions_with_perimeters = {
+        region.plant: region.perimeter for region in region_map.regions
+    }
+    assert regions_with_perimeters == {"A": 10, "B": 8, "C": 10, "D": 4, "E": 8}
+
+
+def test_merged_labels():
+    # the left and right arms of the U start out as separate regions
+    region_map = label_regions(
+        parse(
+            aoc_input.lines(
+                dedent(
+                    """
+                    UXU
+                    UXU
+                    UUU
+                    """
+                )
+            )
         )
-        in regions
     )
-
-    regions_with_perimeters = {region.plant: region.perimeter for region in regions}
-    assert regions_with_perimeters == {"A": 10, "B": 8, "C": 10, "D": 4, "E": 8}
+    assert region_map.regions == [
+        Region("U", area=7, perimeter=16, sides=8),
+        Region("X", area=2, perimeter=6, sides=4),
+    ]
+    assert list(region_map.labels) == [0, 1, 0, 0, 1, 0, 0, 0, 0]
 
 
 def test_internal_regions():
@@ -111,19 +115,6 @@ def test_sides():
     assert regions_with_sides == {"A": 4, "B": 4, "C": 8, "D": 4, "E": 4}
 
 
-def test_sides_detail():
-    region = Region(
-        "A",
-        frozenset(
-            [IntVector2(0, 0), IntVector2(1, 0), IntVector2(2, 0), IntVector2(3, 0)]
-        ),
-    )
-    solver = EdgesSolver(region)
-    edges = solver.get_edges()
-    print(edges)
-    assert len(edges) == 4
-
-
 def test_part_two_answer():
     assert part_two_answer(SIMPLE_INPUT) == 80
     input_with_e = aoc_input.lines(
@@ -152,3 +143,10 @@ def test_part_two_answer():
     )
     assert part_two_answer(input_with_diagonal) == 368
     assert part_two_answer(LARGE_INPUT) == 1206
+
+
+def test_count_corners():
+    region_map = label_regions(parse(LARGE_INPUT))
+    corners = count_corners(region_map.as_array(), len(region_map.regions))
+    assert list(corners) == [region.sides for region in region_map.regions]
+    assert region_map.regions[0] == Region("R", area=12, perimeter=18, sides=10)
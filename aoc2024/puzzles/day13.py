@@ -1,8 +1,7 @@
 from dataclasses import dataclass, replace
 from functools import cached_property
-import itertools
 import re
-from typing import Sequence
+from typing import Iterable, Sequence
 from aoc2024.common.grid import IntVector2
 import aoc2024.common.input as aoc_input
 
@@ -62,21 +61,18 @@ class Machine:
         return replace(self, prize=self.prize + IntVector2(offset, offset))
 
 
-def parse_all(lines: list[str]) -> list[Machine]:
-    results = list[Machine]()
-    for batch in itertools.batched(lines, 4, strict=False):
-        results.append(Machine.parse(batch[:3]))
-    return results
+def parse_all(lines: Iterable[str]) -> list[Machine]:
+    return [Machine.parse(section) for section in aoc_input.iter_sections(lines)]
 
 
-def part_one_answer(lines: list[str]) -> int:
+def part_one_answer(lines: Iterable[str]) -> int:
     machines = parse_all(lines)
     results = (m.get_optimal_presses() for m in machines)
     costs = (o.cost for o in results if o is not None)
     return sum(costs)
 
 
-def part_two_answer(lines: list[str]) -> int:
+def part_two_answer(lines: Iterable[str]) -> int:
     machines = parse_all(lines)
     results = (m.corrected().get_optimal_presses() for m in machines)
     costs = (o.cost for o in results if o is not None)
@@ -84,6 +80,5 @@ def part_two_answer(lines: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day13input")
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day13input")))
+    print("Part Two:", part_two_answer(aoc_input.iter_lines("day13input")))
@@ -1,6 +1,7 @@
 from collections import deque
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Iterable
 from aoc2024.common.grid import BasicGrid, Direction, GridShape, IntVector2
 import aoc2024.common.input as aoc_input
 
@@ -158,18 +159,18 @@ class PuzzleInput:
     moves: list[Direction]
 
     @staticmethod
-    def parse(lines: list[str]):
-        separator = lines.index("")
-        warehouse = Warehouse.parse(lines[:separator])
-        moves = parse_moves(lines[separator + 1 :])
+    def parse(lines: Iterable[str]):
+        warehouse_lines, move_lines = aoc_input.iter_sections(lines)
+        warehouse = Warehouse.parse(warehouse_lines)
+        moves = parse_moves(move_lines)
 
         return PuzzleInput(warehouse, moves)
 
     @staticmethod
-    def parse_wide(lines: list[str]):
-        separator = lines.index("")
-        warehouse = Warehouse.parse_wide(lines[:separator])
-        moves = parse_moves(lines[separator + 1 :])
+    def parse_wide(lines: Iterable[str]):
+        warehouse_lines, move_lines = aoc_input.iter_sections(lines)
+        warehouse = Warehouse.parse_wide(warehouse_lines)
+        moves = parse_moves(move_lines)
 
         return PuzzleInput(warehouse, moves)
 
@@ -1,8 +1,8 @@
-import bisect
 from functools import cached_property
-from typing import Optional, Sequence
+from typing import Iterator, Optional, Sequence
 from aoc2024.common.grid import GridShape, IntVector2
 import aoc2024.common.input as aoc_input
+from aoc2024.common.search import Search
 
 
 def sample_shape() -> GridShape:
@@ -32,37 +32,22 @@ class Region:
         self.obstacles.add(obstacle)
 
     def find_path(self) -> Optional[tuple[int, list[IntVector2]]]:
+        "Returns the length of the shortest path, and the steps along it (not including the start)"
         start = IntVector2(0, 0)
-
-        frontier_by_priority: list[tuple[IntVector2, int]] = [(start, 0)]
-        cost_so_far = dict[IntVector2, int]()
-        cost_so_far[start] = 0
-        came_from = dict[IntVector2, IntVector2]()
-
-        while len(frontier_by_priority) > 0:
-            current, _ = frontier_by_priority.pop()
-
-            if current == self.exit:
-                path = list[IntVector2]()
-                walkback = self.exit
-                while walkback != start:
-                    path.append(walkback)
-                    walkback = came_from[walkback]
-                return (cost_so_far[current], path)
-
-            for next in current.cardinal_neighbors():
-                if not self.shape.is_in_bounds(next) or next in self.obstacles:
-                    continue
-                new_cost = cost_so_far[current] + 1
-                if next not in cost_so_far or new_cost < cost_so_far[next]:
-                    cost_so_far[next] = new_cost
-                    priority = new_cost + next.manhattan_distance(self.exit)
-                    bisect.insort(
-                        frontier_by_priority, (next, priority), key=lambda it: -it[1]
-                    )
-                    came_from[next] = current
-
-        return None
+        search = Search(
+            start,
+            self.neighbors,
+            heuristic=lambda coord: coord.manhattan_distance(self.exit),
+        )
+        exit = search.find(lambda coord: coord == self.exit)
+        if exit is None:
+            return None
+        return (search.cost_so_far[exit], search.path_to(exit)[1:])
+
+    def neighbors(self, coord: IntVector2) -> Iterator[tuple[IntVector2, int]]:
+        for next in coord.cardinal_neighbors():
+            if self.shape.is_in_bounds(next) and next not in self.obstacles:
+                yield (next, 1)
 
     def debug(self):
         return self.shape.format(lambda coord: "#" if coord in self.obstacles else ".")
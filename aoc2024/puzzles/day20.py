@@ -1,4 +1,3 @@
-import bisect
 from collections import deque
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -7,6 +6,7 @@ import sys
 from typing import Optional, cast
 from aoc2024.common.grid import BasicGrid, IntVector2
 import aoc2024.common.input as aoc_input
+from aoc2024.common.search import Search
 
 
 class CheatState(Enum):
@@ -68,18 +68,21 @@ class Maze:
 
     @cache
     def get_flow_map(self) -> BasicGrid[int | None]:
-        flow_map = BasicGrid[int | None].filled(self.walls.shape, None)
-        queue = deque[tuple[IntVector2, int]]()
-        queue.append((self.end, 0))
+        shape = self.walls.shape
+        walls = self.walls.items
+        flow_map = BasicGrid[int | None].filled(shape, None)
+        distances = flow_map.items
+        end = shape.pack(self.end)
+        queue = deque[tuple[int, int]]()
+        queue.append((end, 0))
+        distances[end] = 0
         while len(queue) > 0:
             current, distance = queue.popleft()
-            if self.is_passable(current):
-                prev_distance = flow_map[current]
-                if prev_distance is None or distance < prev_distance:
-                    flow_map[current] = distance
-                    queue.extend(
-                        ((n, distance + 1) for n in current.cardinal_neighbors())
-                    )
+            for n in shape.packed_cardinal_neighbors(current):
+                # breadth-first, so the first distance we find is the shortest
+                if not walls[n] and distances[n] is None:
+                    distances[n] = distance + 1
+                    queue.append((n, distance + 1))
 
         return flow_map
 
@@ -111,30 +114,20 @@ class Maze:
         results = dict[int, int]()
         flow_map = self.get_flow_map()
 
-        frontier_by_priority: list[tuple[IntVector2, int]] = [(self.start, 0)]
-        cost_so_far = dict[IntVector2, int]()
-        cost_so_far[self.start] = 0
-
-        def add_to_frontier(node: IntVector2, cost: int):
-            if node not in cost_so_far or cost < cost_so_far[node]:
-                cost_so_far[node] = cost
-                priority = cost + n.manhattan_distance(self.end)
-                bisect.insort(
-                    frontier_by_priority, (node, priority), key=lambda it: -it[1]
-                )
-
-        while len(frontier_by_priority) > 0:
-            current, _ = frontier_by_priority.pop()
+        search = Search(
+            self.start,
+            lambda coord: (
+                (n, 1) for n in coord.cardinal_neighbors() if self.is_passable(n)
+            ),
+            heuristic=lambda coord: coord.manhattan_distance(self.end),
+        )
+        cost_so_far = search.cost_so_far
 
+        for current in search:
             if current == self.end or cost_so_far[current] > max_length:
                 # no further cheats are optimal
                 return results
 
-            for n in current.cardinal_neighbors():
-                new_cost = cost_so_far[current] + 1
-                if self.is_passable(n):
-                    add_to_frontier(n, new_cost)
-
             cheat_start = current
             for cheat_end in get_surrounding(cheat_start, cheat_length):
                 remaining_cost = flow_map.get_if_in_bounds(cheat_end)
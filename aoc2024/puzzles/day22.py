@@ -1,3 +1,4 @@
+from typing import Iterable
 import aoc2024.common.input as aoc_input
 
 
@@ -31,7 +32,7 @@ def get_nth_secret(secret: int, n: int) -> int:
     return secret
 
 
-def part_one_answer(lines: list[str]) -> int:
+def part_one_answer(lines: Iterable[str]) -> int:
     secrets = map(int, lines)
     return sum(get_nth_secret(s, 2000) for s in secrets)
 
@@ -73,13 +74,12 @@ def optimize_purchases(
     return max(candidates.items(), key=lambda it: it[1])
 
 
-def part_two_answer(lines: list[str]) -> int:
+def part_two_answer(lines: Iterable[str]) -> int:
     secrets = map(int, lines)
     result = optimize_purchases(list(secrets))
     return result[1]
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day22input")
-    print("Part One:", part_one_answer(puzzle_input))
-    print("Part Two:", part_two_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day22input")))
+    print("Part Two:", part_two_answer(aoc_input.iter_lines("day22input")))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum, auto
 import re
+from typing import Iterable
 import aoc2024.common.input as aoc_input
 
 
@@ -57,16 +58,16 @@ class Device:
         self.gates = gates
 
     @staticmethod
-    def parse(lines: list[str]) -> "Device":
-        split = lines.index("")
+    def parse(lines: Iterable[str]) -> "Device":
+        initial_lines, gate_lines = aoc_input.iter_sections(lines)
 
         wires = dict[str, bool]()
-        for initial_line in lines[:split]:
+        for initial_line in initial_lines:
             label, value = initial_line.split(": ")
             value = value == "1"
             wires[label] = value
 
-        gates = (Gate.parse(l) for l in lines[split + 1 :])
+        gates = (Gate.parse(l) for l in gate_lines)
         gates = {g.output: g for g in gates}
 
         return Device(wires, gates)
@@ -127,13 +128,12 @@ class Device:
             place *= 2
 
 
-def part_one_answer(lines: list[str]) -> int:
+def part_one_answer(lines: Iterable[str]) -> int:
     device = Device.parse(lines)
     device.simulate()
     return device.extract_output()
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day24input")
-    print("Part One:", part_one_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day24input")))
     print("Also see day24_part2")
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Iterable
 from aoc2024.common.grid import BasicGrid
 import aoc2024.common.input as aoc_input
 
@@ -43,14 +44,8 @@ class PuzzleInput:
         self.height = self.keys[0].height
 
     @staticmethod
-    def parse(lines: list[str]):
-        schematics = list[Schematic]()
-        lines.append("")  # end with a blank line to simplify separation
-        line_idx = 0
-        while line_idx < len(lines) - 1:
-            next_split = lines.index("", line_idx)
-            schematics.append(Schematic.parse(lines[line_idx:next_split]))
-            line_idx = next_split + 1
+    def parse(lines: Iterable[str]):
+        schematics = [Schematic.parse(s) for s in aoc_input.iter_sections(lines)]
         return PuzzleInput(
             keys=[s for s in schematics if s.type == SchematicType.Key],
             locks=[s for s in schematics if s.type == SchematicType.Lock],
@@ -71,11 +66,10 @@ class PuzzleInput:
         return result
 
 
-def part_one_answer(lines: list[str]):
+def part_one_answer(lines: Iterable[str]):
     puzzle = PuzzleInput.parse(lines)
     return puzzle.find_fitting_combinations()
 
 
 if __name__ == "__main__":
-    puzzle_input = aoc_input.load_lines("day25input")
-    print("Part One:", part_one_answer(puzzle_input))
+    print("Part One:", part_one_answer(aoc_input.iter_lines("day25input")))
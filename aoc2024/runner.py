@@ -0,0 +1,359 @@
+"""Runs and times puzzle solutions across every day.
+
+Usage:
+
+    python -m aoc2024 [DAY ...] [--part 1|2] [--repeat N] [--warmup N] [--json PATH]
+        [--profile cprofile|tracemalloc|sample] [--profile-dir DIR]
+"""
+
+import argparse
+from dataclasses import asdict, dataclass, field
+import importlib
+import inspect
+import json
+import math
+from pathlib import Path
+import pkgutil
+import platform
+import re
+import statistics
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
+import aoc2024.common.input as aoc_input
+from aoc2024.profiling import PROFILERS, profile_call, write_report
+import aoc2024.puzzles
+
+DAY_MODULE_REGEX = re.compile(r"^day(\d\d)$")
+PART_NAMES = {1: "one", 2: "two"}
+
+
+@dataclass(frozen=True)
+class StreamedLines:
+    """
+    Input for a solution that takes any Iterable[str]: every run reads the
+    lines straight from the file with iter_lines(), so parsing overlaps with
+    reading, and reading is part of the timing
+    """
+
+    name: str
+    parent_dir: Path
+
+    def open(self) -> Iterator[str]:
+        return aoc_input.iter_lines(self.name, parent_dir=self.parent_dir)
+
+
+type PuzzleInput = str | list[str] | StreamedLines
+
+
+@dataclass(frozen=True)
+class Solver:
+    day: int
+    part: int
+    module: ModuleType
+    func: Callable[..., object]
+    takes_string: bool
+    "Takes either the whole input as a string, or a list of lines"
+    streams_lines: bool = False
+    "Takes any Iterable[str], so it can be given lines as they're read"
+
+    @property
+    def input_name(self) -> str:
+        return f"day{self.day:02}input"
+
+    @property
+    def label(self) -> str:
+        return f"Day {self.day:02} Part {PART_NAMES[self.part].title()}"
+
+    def load_input(self, parent_dir: Path = aoc_input.PUZZLES_DIR) -> PuzzleInput:
+        if self.takes_string:
+            return aoc_input.load(self.input_name, parent_dir=parent_dir).rstrip("\n")
+        elif self.streams_lines:
+            path = parent_dir / f"{self.input_name}.txt"
+            if not path.exists():
+                raise FileNotFoundError(path)
+            return StreamedLines(self.input_name, parent_dir)
+        else:
+            return aoc_input.load_lines(self.input_name, parent_dir=parent_dir)
+
+    def run(
+        self, puzzle_input: PuzzleInput, kwargs: Mapping[str, object] = {}
+    ) -> object:
+        if isinstance(puzzle_input, StreamedLines):
+            return self.func(puzzle_input.open(), **kwargs)
+        if isinstance(puzzle_input, list):
+            # copy, in case the solution modifies its input
+            puzzle_input = puzzle_input.copy()
+        return self.func(puzzle_input, **kwargs)
+
+
+@dataclass(frozen=True)
+class Skipped:
+    day: int
+    part: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class Failed:
+    day: int
+    part: int
+    error: str
+
+
+def discover_modules() -> Iterator[tuple[int, ModuleType]]:
+    "Yields every dayNN module in aoc2024.puzzles, in order"
+    names = sorted(info.name for info in pkgutil.iter_modules(aoc2024.puzzles.__path__))
+    for name in names:
+        match = DAY_MODULE_REGEX.match(name)
+        if match is None:
+            continue
+        day = int(match.group(1))
+        if day == 0:
+            # the template day
+            continue
+        yield (day, importlib.import_module(f"aoc2024.puzzles.{name}"))
+
+
+def find_solver(day: int, part: int, module: ModuleType) -> Solver | Skipped:
+    part_name = PART_NAMES[part]
+    func = None
+    for name in (f"part_{part_name}_answer", f"part_{part_name}_solution"):
+        func = getattr(module, name, None)
+        if func is not None:
+            break
+    if func is None:
+        return Skipped(day, part, "no solution function")
+
+    parameters = list(inspect.signature(func).parameters.values())
+    if len(parameters) == 0:
+        return Skipped(day, part, "solution doesn't take an input")
+    if any(p.default is inspect.Parameter.empty for p in parameters[1:]):
+        return Skipped(day, part, "solution requires extra arguments")
+    annotation = parameters[0].annotation
+    takes_string = annotation in (str, "str")
+    streams_lines = annotation in (Iterable[str], "Iterable[str]")
+    return Solver(day, part, module, func, takes_string, streams_lines)
+
+
+def discover_solvers(
+    days: Sequence[int] | None = None, parts: Sequence[int] = (1, 2)
+) -> Iterator[Solver | Skipped]:
+    for day, module in discover_modules():
+        if days is not None and day not in days:
+            continue
+        for part in parts:
+            yield find_solver(day, part, module)
+
+
+def clear_caches(module: ModuleType):
+    """
+    Clears functools caches on module-level functions and class methods,
+    so that repeated runs don't just measure cache hits.
+    """
+    for value in vars(module).values():
+        if getattr(value, "__module__", None) != module.__name__:
+            continue
+        candidates = [value]
+        if inspect.isclass(value):
+            candidates.extend(vars(value).values())
+        for candidate in candidates:
+            cache_clear = getattr(candidate, "cache_clear", None)
+            if callable(cache_clear):
+                cache_clear()
+
+
+def percentile(sorted_values: Sequence[int], fraction: float) -> int:
+    "Nearest-rank percentile"
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Timing:
+    day: int
+    part: int
+    answer: str
+    runs_ns: list[int] = field(default_factory=list[int])
+
+    @property
+    def min_ns(self) -> int:
+        return min(self.runs_ns)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.runs_ns)
+
+    @property
+    def p95_ns(self) -> int:
+        return percentile(sorted(self.runs_ns), 0.95)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "min_ns": self.min_ns,
+            "median_ns": self.median_ns,
+            "p95_ns": self.p95_ns,
+        }
+
+
+def time_solver(
+    solver: Solver,
+    puzzle_input: PuzzleInput,
+    repeat: int = 1,
+    warmup: int = 0,
+    kwargs: Mapping[str, object] = {},
+) -> Timing:
+    "`kwargs` are passed to the solution along with the input"
+    assert repeat >= 1, "must run at least once"
+    answer = None
+    for _ in range(warmup):
+        clear_caches(solver.module)
+        solver.run(puzzle_input, kwargs)
+    runs_ns = list[int]()
+    for _ in range(repeat):
+        clear_caches(solver.module)
+        start = time.perf_counter_ns()
+        answer = solver.run(puzzle_input, kwargs)
+        runs_ns.append(time.perf_counter_ns() - start)
+    return Timing(solver.day, solver.part, str(answer), runs_ns)
+
+
+def profile_solver(
+    solver: Solver,
+    puzzle_input: PuzzleInput,
+    kind: str,
+    profile_dir: Path,
+    kwargs: Mapping[str, object] = {},
+) -> Path:
+    "Runs the solver once more under a profiler, and returns where the report went"
+    clear_caches(solver.module)
+    _, report = profile_call(kind, lambda: solver.run(puzzle_input, kwargs))
+    path = profile_dir / f"day{solver.day:02}_part{solver.part}_{kind}.txt"
+    write_report(path, f"{solver.label} ({kind})\n\n{report}")
+    return path
+
+
+def format_ns(ns: float) -> str:
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f}s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    return f"{ns / 1e3:.0f}µs"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2024", description="Run and time puzzle solutions"
+    )
+    parser.add_argument(
+        "days", nargs="*", type=int, help="Days to run; defaults to every day"
+    )
+    parser.add_argument(
+        "-p",
+        "--part",
+        dest="parts",
+        action="append",
+        type=int,
+        choices=(1, 2),
+        help="Part to run; can be repeated. Defaults to both parts",
+    )
+    parser.add_argument(
+        "-r", "--repeat", default=1, type=int, help="Timed runs per part"
+    )
+    parser.add_argument(
+        "-w", "--warmup", default=0, type=int, help="Untimed runs before timing"
+    )
+    parser.add_argument(
+        "--json",
+        metavar="PATH",
+        help="Write machine-readable results to PATH ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--input-dir",
+        type=Path,
+        default=aoc_input.PUZZLES_DIR,
+        help="Directory containing dayNNinput.txt files",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profilers",
+        action="append",
+        choices=sorted(PROFILERS),
+        help="Also profile each part and write a report; can be repeated",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=Path("profiles"),
+        help="Where to write profiling reports. Defaults to ./profiles",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    days: list[int] | None = args.days or None
+    parts: list[int] = args.parts or [1, 2]
+    repeat: int = args.repeat
+    warmup: int = args.warmup
+    input_dir: Path = args.input_dir
+    profilers: list[str] = args.profilers or []
+    profile_dir: Path = args.profile_dir
+    # keep stdout clean when it's used for JSON
+    log = sys.stderr if args.json == "-" else sys.stdout
+
+    timings = list[Timing]()
+    skipped = list[Skipped]()
+    failed = list[Failed]()
+    for solver in discover_solvers(days, parts):
+        if isinstance(solver, Skipped):
+            skipped.append(solver)
+            continue
+        try:
+            puzzle_input = solver.load_input(input_dir)
+        except FileNotFoundError:
+            skipped.append(Skipped(solver.day, solver.part, "input not found"))
+            continue
+        try:
+            timing = time_solver(solver, puzzle_input, repeat=repeat, warmup=warmup)
+            timings.append(timing)
+            print(
+                f"{solver.label}: {timing.answer}"
+                f"  (min {format_ns(timing.min_ns)}"
+                f", median {format_ns(timing.median_ns)}"
+                f", p95 {format_ns(timing.p95_ns)})",
+                file=log,
+            )
+            for kind in profilers:
+                path = profile_solver(solver, puzzle_input, kind, profile_dir)
+                print(f"  {kind} report: {path}", file=log)
+        except Exception as e:
+            # keep going, so one broken solution doesn't lose everyone else's results
+            failure = Failed(solver.day, solver.part, f"{type(e).__name__}: {e}")
+            failed.append(failure)
+            print(f"{solver.label}: failed ({failure.error})", file=sys.stderr)
+    for s in skipped:
+        print(
+            f"Skipped Day {s.day:02} Part {PART_NAMES[s.part].title()}: {s.reason}",
+            file=log,
+        )
+
+    if args.json is not None:
+        report = {
+            "python": platform.python_version(),
+            "repeat": repeat,
+            "warmup": warmup,
+            "results": [t.to_json() for t in timings],
+            "skipped": [asdict(s) for s in skipped],
+            "failed": [asdict(f) for f in failed],
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    return 1 if len(failed) > 0 else 0
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+import shutil
+import aoc2024.common.input as aoc_input
+from aoc2024.runner import (
+    Skipped,
+    Solver,
+    StreamedLines,
+    discover_solvers,
+    main,
+    percentile,
+    time_solver,
+)
+
+
+def test_discover_solvers():
+    solvers = list(discover_solvers(days=[1, 17]))
+    assert [(s.day, s.part) for s in solvers] == [(1, 1), (1, 2), (17, 1), (17, 2)]
+    day_one = solvers[0]
+    assert isinstance(day_one, Solver)
+    assert day_one.takes_string
+    assert isinstance(solvers[2], Solver)
+    assert not solvers[2].takes_string
+    # part two needs a hand-written function for the specific input
+    assert isinstance(solvers[3], Skipped)
+
+
+def test_streamed_lines(tmp_path: Path):
+    [solver] = discover_solvers(days=[2], parts=[1])
+    assert isinstance(solver, Solver)
+    assert solver.streams_lines
+    shutil.copy(aoc_input.PUZZLES_DIR / "day02sample.txt", tmp_path / "day02input.txt")
+    puzzle_input = solver.load_input(tmp_path)
+    assert isinstance(puzzle_input, StreamedLines)
+    # read again for every run
+    assert solver.run(puzzle_input) == solver.run(puzzle_input) == 2
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.5) == 50
+    assert percentile([7], 0.95) == 7
+
+
+def test_time_solver():
+    [solver] = discover_solvers(days=[2], parts=[1])
+    assert isinstance(solver, Solver)
+    puzzle_input = aoc_input.load_lines("day02sample")
+    timing = time_solver(solver, puzzle_input, repeat=3, warmup=1)
+    assert timing.answer == "2"
+    assert len(timing.runs_ns) == 3
+    assert timing.min_ns <= timing.median_ns <= timing.p95_ns
+
+
+def test_main_json(tmp_path: Path):
+    shutil.copy(aoc_input.PUZZLES_DIR / "day02sample.txt", tmp_path / "day02input.txt")
+    output = tmp_path / "results.json"
+    exit_code = main(
+        ["2", "3", "--input-dir", str(tmp_path), "-r", "2", "--json", str(output)]
+    )
+    assert exit_code == 0
+    report = json.loads(output.read_text())
+    assert [(r["day"], r["part"], r["answer"]) for r in report["results"]] == [
+        (2, 1, "2"),
+        (2, 2, "4"),
+    ]
+    assert all(len(r["runs_ns"]) == 2 for r in report["results"])
+    assert {(s["day"], s["reason"]) for s in report["skipped"]} == {
+        (3, "input not found")
+    }
+
+
+def test_main_failure(tmp_path: Path):
+    (tmp_path / "day01input.txt").write_text("1   x\n", encoding="utf-8")
+    shutil.copy(aoc_input.PUZZLES_DIR / "day02sample.txt", tmp_path / "day02input.txt")
+    output = tmp_path / "results.json"
+    exit_code = main(["1", "2", "--input-dir", str(tmp_path), "--json", str(output)])
+    assert exit_code == 1
+    report = json.loads(output.read_text())
+    # the days that work still get their results
+    assert [(r["day"], r["part"]) for r in report["results"]] == [(2, 1), (2, 2)]
+    assert [(f["day"], f["part"]) for f in report["failed"]] == [(1, 1), (1, 2)]
+    assert report["failed"][0]["error"].startswith("ValueError: ")
+
+
+def test_main_profile(tmp_path: Path):
+    shutil.copy(aoc_input.PUZZLES_DIR / "day02sample.txt", tmp_path / "day02input.txt")
+    profile_dir = tmp_path / "profiles"
+    exit_code = main(
+        [
+            "2",
+            "--part",
+            "1",
+            "--input-dir",
+            str(tmp_path),
+            "--profile",
+            "cprofile",
+            "--profile",
+            "tracemalloc",
+            "--profile-dir",
+            str(profile_dir),
+        ]
+    )
+    assert exit_code == 0
+    assert sorted(p.name for p in profile_dir.iterdir()) == [
+        "day02_part1_cprofile.txt",
+        "day02_part1_tracemalloc.txt",
+    ]
+    report = (profile_dir / "day02_part1_cprofile.txt").read_text()
+    assert report.startswith("Day 02 Part One (cprofile)")
+    assert "day02.py" in report